@@ -127,17 +127,21 @@ class ChatConsumer(AsyncWebsocketConsumer):
             self.channel_name
         )
     
+    # Inbound frame type -> handler method name
+    MESSAGE_HANDLERS = {
+        'user_message': 'handle_user_message',
+        'workflow_event': 'handle_workflow_event',
+    }
+    
     async def receive(self, text_data):
         text_data_json = json.loads(text_data)
-        message_type = text_data_json.get('type', 'message')
-        message_data = text_data_json.get('data', {})
         
-        if message_type == 'user_message':
-            # Handle user message
-            await self.handle_user_message(message_data)
-        elif message_type == 'workflow_event':
-            # Handle workflow event
-            await self.handle_workflow_event(message_data)
+        # Frames without a known type are ignored before touching the payload
+        handler_name = self.MESSAGE_HANDLERS.get(text_data_json.get('type'))
+        if handler_name is None:
+            return
+        
+        await getattr(self, handler_name)(text_data_json.get('data') or {})
     
     async def handle_user_message(self, message_data):
         # Process user message and send response
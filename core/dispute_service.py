@@ -1,23 +1,117 @@
 from django.utils import timezone
-from django.db.models import Q
-from django.utils import timezone
-from .models import Dispute, Booking, User, Signature, BusinessAlert, DisputeMessage
+from django.db import transaction
+from django.db.models import Q, Count, Case, When, Value, Subquery, ExpressionWrapper, BooleanField
+from django.core.mail import send_mass_mail
+from django.conf import settings
+from django.core.cache import cache
+from .models import Dispute, Booking, User, Signature, BusinessAlert, DisputeMessage, Payment, AuditLog
 from .utils import AuditLogger
+from .permissions import DISPUTE_ADMIN_ROLES
 from .notification_service import NotificationService
+from .tasks import (
+    send_dispute_notifications_task, send_dispute_notifications_batch_task, notify_message_sent_task
+)
 import logging
 import uuid
 from datetime import timedelta
+from string import Template
+from types import MappingProxyType
 from typing import Dict, List, Optional
 from decimal import Decimal
 
 logger = logging.getLogger(__name__)
 
+# Dispute statuses that count towards a mediator's workload
+_ACTIVE_MEDIATION_STATUSES = ('investigating', 'mediation')
+
+# Dispute statuses with nothing left to analyse or escalate
+_TERMINAL_DISPUTE_STATUSES = frozenset({'resolved', 'closed'})
+
+# Booking statuses that count as a finished job in vendor/customer history
+_FINISHED_BOOKING_STATUSES = ('completed', 'signed')
+
+# Vendor/customer history only feeds suggestions, so a few minutes of staleness is acceptable
+_HISTORY_CACHE_TTL = 300
+
+# Upper bound on a single vendor response; longer responses are rejected so one row stays small
+_MAX_VENDOR_RESPONSE_LENGTH = 64 * 1024
+
+# Rows per INSERT when writing system messages, to stay under backend parameter limits
+_SYSTEM_MESSAGE_BATCH_SIZE = 500
+
+# Default severity assigned to a new dispute of each type
+_SEVERITY_MAPPING = MappingProxyType({
+    'service_quality': 'high',
+    'payment_issue': 'critical',
+    'signature_refusal': 'high',
+    'vendor_behavior': 'medium',
+    'customer_behavior': 'medium',
+    'booking_cancellation': 'low',
+    'other': 'medium'
+})
+
+# Email subject per dispute event, formatted with the dispute title
+_SUBJECT_TEMPLATES = MappingProxyType({
+    'created': 'Dispute Created: {title}',
+    'assigned': 'Dispute Assigned: {title}',
+    'vendor_responded': 'Vendor Response: {title}',
+    'resolved': 'Dispute Resolved: {title}',
+    'escalated': 'Dispute Escalated: {title}'
+})
+
+# Escalation buckets from most to least urgent, with the urgency and timeline they map to
+_ESCALATION_TIERS = (
+    ('immediate_escalation', 'immediate', 'Now'),
+    ('escalate_in_24h', 'high', 'Within 24 hours'),
+    ('escalate_in_48h', 'medium', 'Within 48 hours'),
+)
+
+# Participant email body; dispute fields are filled once per event, name and role per recipient
+_NOTIFICATION_BODY = Template("""
+                    Hello $name,
+                    
+                    There has been an update to dispute $dispute_id $role_context.
+                    
+                    Dispute Details:
+                    - Title: $title
+                    - Type: $dispute_type
+                    - Status: $status
+                    - Booking: $booking_id
+                    
+                    Event: $event
+                    
+                    Please log in to your dashboard to view more details.
+                    
+                    Best regards,
+                    HomeServe Pro Team
+                    """)
+
 
 class AdvancedDisputeService:
     """
     Enhanced dispute resolution with AI-powered suggestions and smart escalation
     """
     
+    # Dispute type -> suggestion builder; types without an entry get no suggestions
+    SUGGESTION_HANDLERS = {
+        'service_quality': '_suggest_for_service_quality',
+        'payment_issue': '_suggest_for_payment_issue',
+        'vendor_behavior': '_suggest_for_vendor_behavior',
+    }
+    
+    @staticmethod
+    def load(dispute_id):
+        """
+        Fetch a dispute with everything the analysis helpers read
+        
+        Booking, service, signature and payment come in one JOIN and photos in
+        one prefetch, so auto_resolve_disputes and escalation_matrix do not
+        lazy-load each relation separately.
+        """
+        return Dispute.objects.select_related(
+            'booking__service', 'booking__signature', 'booking__payment', 'vendor', 'customer'
+        ).prefetch_related('booking__photos').get(id=dispute_id)
+    
     @staticmethod
     def auto_resolve_disputes(dispute):
         """
@@ -25,6 +119,23 @@ class AdvancedDisputeService:
         Currently rule-based, ready for ML enhancement
         """
         try:
+            now = timezone.now()
+            
+            # Closed-out disputes need no analysis, so skip the history lookups entirely
+            if dispute.status in _TERMINAL_DISPUTE_STATUSES:
+                return {
+                    'dispute_id': str(dispute.id),
+                    'context_analysis': None,
+                    'resolution_suggestions': [],
+                    'auto_resolution': {
+                        'eligible': False,
+                        'reason': f'Dispute already {dispute.status}',
+                        'suggested_action': None
+                    },
+                    'confidence_score': None,
+                    'generated_at': now.isoformat()
+                }
+            
             # Get dispute context
             context = AdvancedDisputeService._analyze_dispute_context(dispute)
             
@@ -39,15 +150,15 @@ class AdvancedDisputeService:
                 'context_analysis': context,
                 'resolution_suggestions': suggestions,
                 'auto_resolution': auto_resolution,
-                'confidence_score': AdvancedDisputeService._calculate_confidence_score(dispute, suggestions),
-                'generated_at': timezone.now().isoformat()
+                'confidence_score': AdvancedDisputeService._calculate_confidence_score(dispute, suggestions, context),
+                'generated_at': now.isoformat()
             }
             
-            logger.info(f"Auto-resolution analysis completed for dispute {dispute.id}")
+            logger.info("Auto-resolution analysis completed for dispute %s", dispute.id)
             return result
             
         except Exception as e:
-            logger.error(f"Failed to analyze dispute {dispute.id}: {str(e)}")
+            logger.exception("Failed to analyze dispute %s", dispute.id)
             return {'error': str(e)}
     
     @staticmethod
@@ -56,73 +167,143 @@ class AdvancedDisputeService:
         Smart escalation based on severity, type, and context
         """
         try:
-            escalation_rules = {
-                'immediate_escalation': [],
-                'escalate_in_24h': [],
-                'escalate_in_48h': [],
-                'no_escalation_needed': []
-            }
+            now = timezone.now()
+            if dispute.status in _TERMINAL_DISPUTE_STATUSES:
+                return AdvancedDisputeService._build_escalation_matrix(dispute, None, now)
             
-            # Check immediate escalation conditions
-            if dispute.severity == 'critical':
-                escalation_rules['immediate_escalation'].append({
-                    'reason': 'Critical severity level',
-                    'escalate_to': 'super_admin',
-                    'action': 'Immediate attention required'
-                })
-            
-            if dispute.dispute_type == 'payment_issue' and hasattr(dispute.booking, 'payment'):
-                payment_amount = float(dispute.booking.payment.amount)
-                if payment_amount > 5000:  # High-value disputes
-                    escalation_rules['immediate_escalation'].append({
-                        'reason': f'High-value payment dispute (₹{payment_amount})',
-                        'escalate_to': 'super_admin',
-                        'action': 'Finance team involvement required'
-                    })
-            
-            # Check vendor performance history
             vendor_history = AdvancedDisputeService._get_vendor_dispute_history(dispute.vendor)
-            if vendor_history['dispute_rate'] > 15:  # More than 15% dispute rate
-                escalation_rules['escalate_in_24h'].append({
-                    'reason': f'Vendor has high dispute rate ({vendor_history["dispute_rate"]}%)',
-                    'escalate_to': 'ops_manager',
-                    'action': 'Vendor performance review required'
-                })
-            
-            # Check resolution timeline
-            dispute_age_hours = (timezone.now() - dispute.created_at).total_seconds() / 3600
-            if dispute_age_hours > 48 and dispute.status == 'investigating':
-                escalation_rules['escalate_in_24h'].append({
-                    'reason': 'Dispute unresolved for >48 hours',
-                    'escalate_to': 'ops_manager',
-                    'action': 'Priority resolution required'
-                })
-            
-            # Customer satisfaction impact
-            if dispute.dispute_type in ['service_quality', 'vendor_behavior']:
-                escalation_rules['escalate_in_48h'].append({
-                    'reason': 'Customer satisfaction impact',
-                    'escalate_to': 'ops_manager',
-                    'action': 'Quality assurance review'
-                })
-            
-            # If no escalation needed
-            if not any(escalation_rules[key] for key in ['immediate_escalation', 'escalate_in_24h', 'escalate_in_48h']):
-                escalation_rules['no_escalation_needed'].append({
-                    'reason': 'Standard dispute resolution process adequate',
-                    'action': 'Continue with assigned mediator'
-                })
+            return AdvancedDisputeService._build_escalation_matrix(dispute, vendor_history, now)
             
+        except Exception as e:
+            logger.exception("Failed to generate escalation matrix for dispute %s", dispute.id)
+            return {'error': str(e)}
+    
+    @staticmethod
+    def bulk_escalation_matrix(disputes, now=None):
+        """
+        Escalation matrices for a queryset of disputes, in queryset order
+        
+        Relations are loaded with the disputes and vendor history comes from two
+        grouped COUNT queries, so a sweep costs a fixed number of queries rather
+        than several per dispute. All disputes share one reference timestamp,
+        which callers running several sweeps can pass in as `now`.
+        """
+        disputes = list(disputes.select_related('booking__payment', 'vendor', 'customer'))
+        now = now or timezone.now()
+        
+        vendor_ids = {dispute.vendor_id for dispute in disputes if dispute.vendor_id}
+        finished_jobs = dict(
+            Booking.objects.filter(vendor_id__in=vendor_ids, status__in=_FINISHED_BOOKING_STATUSES)
+            .order_by().values('vendor_id').annotate(count=Count('id')).values_list('vendor_id', 'count')
+        )
+        dispute_counts = dict(
+            Dispute.objects.filter(vendor_id__in=vendor_ids)
+            .order_by().values('vendor_id').annotate(count=Count('id')).values_list('vendor_id', 'count')
+        )
+        vendor_histories = {
+            vendor_id: AdvancedDisputeService._summarize_vendor_disputes(
+                finished_jobs.get(vendor_id, 0), dispute_counts.get(vendor_id, 0)
+            )
+            for vendor_id in vendor_ids
+        }
+        no_history = AdvancedDisputeService._summarize_vendor_disputes(0, 0)
+        
+        results = []
+        for dispute in disputes:
+            try:
+                results.append(AdvancedDisputeService._build_escalation_matrix(
+                    dispute, vendor_histories.get(dispute.vendor_id, no_history), now
+                ))
+            except Exception as e:
+                logger.exception("Failed to generate escalation matrix for dispute %s", dispute.id)
+                results.append({'dispute_id': str(dispute.id), 'error': str(e)})
+        
+        return results
+    
+    @staticmethod
+    def _build_escalation_matrix(dispute, vendor_history, now):
+        """Escalation matrix from an already-computed vendor history (unused for terminal disputes)"""
+        escalation_rules = {
+            'immediate_escalation': [],
+            'escalate_in_24h': [],
+            'escalate_in_48h': [],
+            'no_escalation_needed': []
+        }
+        
+        if dispute.status in _TERMINAL_DISPUTE_STATUSES:
+            no_action = {
+                'reason': f'Dispute already {dispute.status}',
+                'action': 'No further action required'
+            }
+            escalation_rules['no_escalation_needed'].append(no_action)
             return {
                 'dispute_id': str(dispute.id),
                 'escalation_matrix': escalation_rules,
-                'recommended_action': AdvancedDisputeService._get_recommended_escalation_action(escalation_rules),
-                'analysis_timestamp': timezone.now().isoformat()
+                'recommended_action': {
+                    'urgency': 'none',
+                    'action': no_action,
+                    'timeline': 'No escalation needed'
+                },
+                'analysis_timestamp': now.isoformat()
             }
-            
-        except Exception as e:
-            logger.error(f"Failed to generate escalation matrix for dispute {dispute.id}: {str(e)}")
-            return {'error': str(e)}
+        
+        # Check immediate escalation conditions
+        if dispute.severity == 'critical':
+            escalation_rules['immediate_escalation'].append({
+                'reason': 'Critical severity level',
+                'escalate_to': 'super_admin',
+                'action': 'Immediate attention required'
+            })
+        
+        # Reads the select_related payment from load(); None when the booking has no payment
+        payment = getattr(dispute.booking, 'payment', None)
+        if dispute.dispute_type == 'payment_issue' and payment is not None:
+            payment_amount = float(payment.amount)
+            if payment_amount > 5000:  # High-value disputes
+                escalation_rules['immediate_escalation'].append({
+                    'reason': f'High-value payment dispute (₹{payment_amount})',
+                    'escalate_to': 'super_admin',
+                    'action': 'Finance team involvement required'
+                })
+        
+        # Check vendor performance history
+        if vendor_history['dispute_rate'] > 15:  # More than 15% dispute rate
+            escalation_rules['escalate_in_24h'].append({
+                'reason': f'Vendor has high dispute rate ({vendor_history["dispute_rate"]}%)',
+                'escalate_to': 'ops_manager',
+                'action': 'Vendor performance review required'
+            })
+        
+        # Check resolution timeline
+        dispute_age_hours = (now - dispute.created_at).total_seconds() / 3600
+        if dispute_age_hours > 48 and dispute.status == 'investigating':
+            escalation_rules['escalate_in_24h'].append({
+                'reason': 'Dispute unresolved for >48 hours',
+                'escalate_to': 'ops_manager',
+                'action': 'Priority resolution required'
+            })
+        
+        # Customer satisfaction impact
+        if dispute.dispute_type in ['service_quality', 'vendor_behavior']:
+            escalation_rules['escalate_in_48h'].append({
+                'reason': 'Customer satisfaction impact',
+                'escalate_to': 'ops_manager',
+                'action': 'Quality assurance review'
+            })
+        
+        # If no escalation needed
+        if not any(escalation_rules[bucket] for bucket, _, _ in _ESCALATION_TIERS):
+            escalation_rules['no_escalation_needed'].append({
+                'reason': 'Standard dispute resolution process adequate',
+                'action': 'Continue with assigned mediator'
+            })
+        
+        return {
+            'dispute_id': str(dispute.id),
+            'escalation_matrix': escalation_rules,
+            'recommended_action': AdvancedDisputeService._get_recommended_escalation_action(escalation_rules),
+            'analysis_timestamp': now.isoformat()
+        }
     
     @staticmethod
     def _analyze_dispute_context(dispute):
@@ -134,7 +315,9 @@ class AdvancedDisputeService:
             'service_type': dispute.booking.service.name,
             'vendor_experience': AdvancedDisputeService._get_vendor_experience(dispute.vendor),
             'customer_history': AdvancedDisputeService._get_customer_history(dispute.customer),
-            'has_photos': bool(dispute.booking.photos.exists()),
+            'has_photos': bool(dispute.booking.photos.all()),
+            'customer_evidence_present': bool(dispute.customer_evidence),
+            'vendor_evidence_present': bool(dispute.vendor_evidence),
             'signature_status': getattr(dispute.booking, 'signature', None) and dispute.booking.signature.status or 'none'
         }
         
@@ -143,68 +326,82 @@ class AdvancedDisputeService:
     @staticmethod
     def _generate_resolution_suggestions(dispute, context):
         """Generate smart resolution suggestions based on context"""
+        handler = AdvancedDisputeService.SUGGESTION_HANDLERS.get(dispute.dispute_type)
+        if handler is None:
+            return []
+        return getattr(AdvancedDisputeService, handler)(dispute, context)
+    
+    @staticmethod
+    def _suggest_for_service_quality(dispute, context):
+        """Service quality disputes"""
         suggestions = []
+        booking_value = context['booking_value']
         
-        # Service quality disputes
-        if dispute.dispute_type == 'service_quality':
-            if context['has_photos']:
-                suggestions.append({
-                    'type': 'evidence_review',
-                    'suggestion': 'Review before/after photos for service quality assessment',
-                    'priority': 'high',
-                    'estimated_resolution_time': '2-4 hours'
-                })
-            
-            if context['booking_value'] < 1000:
-                suggestions.append({
-                    'type': 'partial_refund',
-                    'suggestion': f'Consider 25-50% refund (₹{context["booking_value"] * 0.25:.0f}-{context["booking_value"] * 0.5:.0f})',
-                    'priority': 'medium',
-                    'estimated_resolution_time': '1-2 hours'
-                })
-            else:
-                suggestions.append({
-                    'type': 'service_redo',
-                    'suggestion': 'Offer free service redo with different vendor',
-                    'priority': 'high',
-                    'estimated_resolution_time': '4-8 hours'
-                })
+        if context['has_photos']:
+            suggestions.append({
+                'type': 'evidence_review',
+                'suggestion': 'Review before/after photos for service quality assessment',
+                'priority': 'high',
+                'estimated_resolution_time': '2-4 hours'
+            })
         
-        # Payment disputes
-        elif dispute.dispute_type == 'payment_issue':
+        if booking_value < 1000:
             suggestions.append({
-                'type': 'payment_verification',
-                'suggestion': 'Verify payment processing logs and Stripe records',
-                'priority': 'critical',
+                'type': 'partial_refund',
+                'suggestion': f'Consider 25-50% refund (₹{booking_value * 0.25:.0f}-{booking_value * 0.5:.0f})',
+                'priority': 'medium',
                 'estimated_resolution_time': '1-2 hours'
             })
-            
-            if context['signature_status'] != 'signed':
-                suggestions.append({
-                    'type': 'signature_review',
-                    'suggestion': 'Payment hold justified - signature not completed',
-                    'priority': 'high',
-                    'estimated_resolution_time': '30 minutes'
-                })
+        else:
+            suggestions.append({
+                'type': 'service_redo',
+                'suggestion': 'Offer free service redo with different vendor',
+                'priority': 'high',
+                'estimated_resolution_time': '4-8 hours'
+            })
         
-        # Vendor behavior disputes
-        elif dispute.dispute_type == 'vendor_behavior':
-            vendor_exp = context['vendor_experience']
-            if vendor_exp['total_jobs'] < 10:
-                suggestions.append({
-                    'type': 'vendor_training',
-                    'suggestion': 'New vendor - provide additional training and monitoring',
-                    'priority': 'medium',
-                    'estimated_resolution_time': '2-4 hours'
-                })
-            
+        return suggestions
+    
+    @staticmethod
+    def _suggest_for_payment_issue(dispute, context):
+        """Payment disputes"""
+        suggestions = [{
+            'type': 'payment_verification',
+            'suggestion': 'Verify payment processing logs and Stripe records',
+            'priority': 'critical',
+            'estimated_resolution_time': '1-2 hours'
+        }]
+        
+        if context['signature_status'] != 'signed':
+            suggestions.append({
+                'type': 'signature_review',
+                'suggestion': 'Payment hold justified - signature not completed',
+                'priority': 'high',
+                'estimated_resolution_time': '30 minutes'
+            })
+        
+        return suggestions
+    
+    @staticmethod
+    def _suggest_for_vendor_behavior(dispute, context):
+        """Vendor behavior disputes"""
+        suggestions = []
+        
+        if context['vendor_experience']['total_jobs'] < 10:
             suggestions.append({
-                'type': 'compensation',
-                'suggestion': f'Provide service credit of ₹{context["booking_value"] * 0.5:.0f}',
+                'type': 'vendor_training',
+                'suggestion': 'New vendor - provide additional training and monitoring',
                 'priority': 'medium',
-                'estimated_resolution_time': '1-2 hours'
+                'estimated_resolution_time': '2-4 hours'
             })
         
+        suggestions.append({
+            'type': 'compensation',
+            'suggestion': f'Provide service credit of ₹{context["booking_value"] * 0.5:.0f}',
+            'priority': 'medium',
+            'estimated_resolution_time': '1-2 hours'
+        })
+        
         return suggestions
     
     @staticmethod
@@ -234,25 +431,25 @@ class AdvancedDisputeService:
         return auto_resolution
     
     @staticmethod
-    def _calculate_confidence_score(dispute, suggestions):
-        """Calculate confidence score for resolution suggestions"""
+    def _calculate_confidence_score(dispute, suggestions, context):
+        """Calculate confidence score for resolution suggestions from the analyzed context"""
         base_score = 70
         
         # Increase confidence based on available evidence
-        if hasattr(dispute.booking, 'photos') and dispute.booking.photos.exists():
+        if context['has_photos']:
             base_score += 10
         
-        if dispute.customer_evidence:
+        if context['customer_evidence_present']:
             base_score += 10
         
-        if dispute.vendor_evidence:
+        if context['vendor_evidence_present']:
             base_score += 10
         
         # Decrease confidence for complex disputes
-        if dispute.severity == 'critical':
+        if context['severity'] == 'critical':
             base_score -= 15
         
-        if dispute.dispute_type in ['payment_issue', 'vendor_behavior']:
+        if context['dispute_type'] in ['payment_issue', 'vendor_behavior']:
             base_score -= 10
         
         return min(95, max(30, base_score))
@@ -263,13 +460,24 @@ class AdvancedDisputeService:
         if not vendor:
             return {'total_jobs': 0, 'disputes': 0, 'dispute_rate': 0}
         
-        from django.apps import apps
-        Booking = apps.get_model('core', 'Booking')
-        Dispute = apps.get_model('core', 'Dispute')
-        
-        total_jobs = Booking.objects.filter(vendor=vendor, status__in=['completed', 'signed']).count()
-        disputes = Dispute.objects.filter(vendor=vendor).count()
+        return AdvancedDisputeService._cached(
+            f"dispute_history:vendor_disputes:{vendor.id}",
+            lambda: AdvancedDisputeService._compute_vendor_dispute_history(vendor)
+        )
+    
+    @staticmethod
+    def _compute_vendor_dispute_history(vendor):
+        """Count finished jobs and disputes for a vendor"""
+        total_jobs = Booking.objects.filter(
+            vendor=vendor, status__in=_FINISHED_BOOKING_STATUSES
+        ).aggregate(total_jobs=Count('id'))['total_jobs']
+        disputes = Dispute.objects.filter(vendor=vendor).aggregate(disputes=Count('id'))['disputes']
         
+        return AdvancedDisputeService._summarize_vendor_disputes(total_jobs, disputes)
+    
+    @staticmethod
+    def _summarize_vendor_disputes(total_jobs, disputes):
+        """Vendor dispute history dict from raw job and dispute counts"""
         dispute_rate = (disputes / total_jobs * 100) if total_jobs > 0 else 0
         
         return {
@@ -284,13 +492,21 @@ class AdvancedDisputeService:
         if not vendor:
             return {'total_jobs': 0, 'completion_rate': 0, 'avg_rating': 0}
         
-        from django.apps import apps
-        Booking = apps.get_model('core', 'Booking')
-        
-        total_jobs = Booking.objects.filter(vendor=vendor).count()
-        completed_jobs = Booking.objects.filter(vendor=vendor, status__in=['completed', 'signed']).count()
+        return AdvancedDisputeService._cached(
+            f"dispute_history:vendor_experience:{vendor.id}",
+            lambda: AdvancedDisputeService._compute_vendor_experience(vendor)
+        )
+    
+    @staticmethod
+    def _compute_vendor_experience(vendor):
+        """Count total and finished jobs for a vendor"""
+        counts = Booking.objects.filter(vendor=vendor).aggregate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(status__in=_FINISHED_BOOKING_STATUSES))
+        )
+        total_jobs = counts['total']
         
-        completion_rate = (completed_jobs / total_jobs * 100) if total_jobs > 0 else 0
+        completion_rate = (counts['completed'] / total_jobs * 100) if total_jobs > 0 else 0
         
         # Get average rating (simplified)
         avg_rating = 4.2  # Placeholder - would calculate from signatures
@@ -304,45 +520,57 @@ class AdvancedDisputeService:
     @staticmethod
     def _get_customer_history(customer):
         """Get customer booking history"""
-        from django.apps import apps
-        Booking = apps.get_model('core', 'Booking')
-        
-        total_bookings = Booking.objects.filter(customer=customer).count()
-        completed_bookings = Booking.objects.filter(customer=customer, status__in=['completed', 'signed']).count()
+        return AdvancedDisputeService._cached(
+            f"dispute_history:customer:{customer.id}",
+            lambda: AdvancedDisputeService._compute_customer_history(customer)
+        )
+    
+    @staticmethod
+    def _compute_customer_history(customer):
+        """Count total and finished bookings for a customer"""
+        counts = Booking.objects.filter(customer=customer).aggregate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(status__in=_FINISHED_BOOKING_STATUSES))
+        )
         
         return {
-            'total_bookings': total_bookings,
-            'completed_bookings': completed_bookings,
-            'is_frequent_customer': total_bookings > 5
+            'total_bookings': counts['total'],
+            'completed_bookings': counts['completed'],
+            'is_frequent_customer': counts['total'] > 5
         }
     
+    @staticmethod
+    def _cached(key, compute):
+        """Return a cached history metric, computing and storing it on a miss"""
+        return cache.get_or_set(key, compute, _HISTORY_CACHE_TTL)
+    
+    @staticmethod
+    def invalidate_history(vendor_id=None, customer_id=None):
+        """Drop cached history metrics after disputes or bookings change"""
+        keys = []
+        if vendor_id:
+            keys += [f"dispute_history:vendor_disputes:{vendor_id}", f"dispute_history:vendor_experience:{vendor_id}"]
+        if customer_id:
+            keys.append(f"dispute_history:customer:{customer_id}")
+        if keys:
+            cache.delete_many(keys)
+    
     @staticmethod
     def _get_recommended_escalation_action(escalation_rules):
         """Get the most urgent escalation action"""
-        if escalation_rules['immediate_escalation']:
-            return {
-                'urgency': 'immediate',
-                'action': escalation_rules['immediate_escalation'][0],
-                'timeline': 'Now'
-            }
-        elif escalation_rules['escalate_in_24h']:
-            return {
-                'urgency': 'high',
-                'action': escalation_rules['escalate_in_24h'][0],
-                'timeline': 'Within 24 hours'
-            }
-        elif escalation_rules['escalate_in_48h']:
-            return {
-                'urgency': 'medium',
-                'action': escalation_rules['escalate_in_48h'][0],
-                'timeline': 'Within 48 hours'
-            }
-        else:
-            return {
-                'urgency': 'low',
-                'action': escalation_rules['no_escalation_needed'][0],
-                'timeline': 'No escalation needed'
-            }
+        for bucket, urgency, timeline in _ESCALATION_TIERS:
+            if escalation_rules[bucket]:
+                return {
+                    'urgency': urgency,
+                    'action': escalation_rules[bucket][0],
+                    'timeline': timeline
+                }
+        
+        return {
+            'urgency': 'low',
+            'action': escalation_rules['no_escalation_needed'][0],
+            'timeline': 'No escalation needed'
+        }
 
 
 class DisputeResolutionService:
@@ -362,175 +590,340 @@ class DisputeResolutionService:
             evidence: Customer evidence (photos, documents)
         """
         try:
-            # Check if dispute already exists for this booking
-            existing_dispute = Dispute.objects.filter(
-                booking=booking,
-                status__in=['open', 'investigating', 'mediation']
-            ).first()
-            
-            if existing_dispute:
-                logger.warning(f"Dispute already exists for booking {booking.id}")
-                return existing_dispute
-            
-            # Determine severity based on dispute type
-            severity_mapping = {
-                'service_quality': 'high',
-                'payment_issue': 'critical',
-                'signature_refusal': 'high',
-                'vendor_behavior': 'medium',
-                'customer_behavior': 'medium',
-                'booking_cancellation': 'low',
-                'other': 'medium'
-            }
-            
-            severity = severity_mapping.get(dispute_type, 'medium')
-            
-            # Create dispute
-            dispute = Dispute.objects.create(
-                booking=booking,
-                customer=customer,
-                vendor=booking.vendor,
-                dispute_type=dispute_type,
-                title=title,
-                description=description,
-                customer_evidence=evidence,
-                severity=severity
-            )
-            
-            # Update booking status
-            booking.status = 'disputed'
-            booking.save()
-            
-            # Create initial system message
-            DisputeResolutionService._create_system_message(
-                dispute,
-                f"Dispute created by {customer.get_full_name()}: {title}"
-            )
-            
-            # Create business alert
-            alert_data = {
-                'dispute_id': str(dispute.id),
-                'booking_id': str(booking.id),
-                'dispute_type': dispute_type,
-                'customer': customer.get_full_name(),
-                'vendor': booking.vendor.get_full_name() if booking.vendor else 'N/A',
-                'severity': severity
-            }
-            
-            BusinessAlert.objects.create(
-                alert_type='dispute_created',
-                severity=severity,
-                title=f"New Dispute: {title}",
-                description=f"Customer {customer.get_full_name()} created a dispute for booking {booking.id}",
-                related_booking=booking,
-                metadata=alert_data
-            )
-            
-            # Auto-assign mediator based on dispute type and severity
-            mediator = DisputeResolutionService._auto_assign_mediator(dispute)
-            if mediator:
-                dispute.assign_mediator(mediator)
-            
-            # Send notifications
-            DisputeResolutionService._send_dispute_notifications(dispute, 'created')
-            
-            # Log audit trail
-            AuditLogger.log_action(
-                user=customer,
-                action='dispute_created',
-                resource_type='Dispute',
-                resource_id=str(dispute.id),
-                new_values={'dispute_type': dispute_type, 'title': title}
-            )
+            with transaction.atomic():
+                # Lock the booking so concurrent requests cannot open two disputes for it
+                booking = Booking.objects.select_for_update(of=('self',)).select_related(
+                    'vendor'
+                ).get(pk=booking.pk)
+                
+                # Check if dispute already exists for this booking
+                # Only the id is read, from the (booking, status) index; the full row is
+                # fetched in the rare case where a dispute is already open
+                existing_id = Dispute.objects.filter(
+                    booking=booking,
+                    status__in=['open', 'investigating', 'mediation']
+                ).values_list('id', flat=True).first()
+                
+                if existing_id:
+                    logger.warning("Dispute already exists for booking %s", booking.id)
+                    return Dispute.objects.get(id=existing_id)
+                
+                # Determine severity based on dispute type
+                severity = _SEVERITY_MAPPING.get(dispute_type, 'medium')
+                
+                # Names are reused by the system message, alert and its metadata
+                customer_name = customer.full_name
+                vendor_name = booking.vendor.full_name if booking.vendor else 'N/A'
+                
+                # Create dispute
+                dispute = Dispute.objects.create(
+                    booking=booking,
+                    customer=customer,
+                    vendor=booking.vendor,
+                    dispute_type=dispute_type,
+                    title=title,
+                    description=description,
+                    customer_evidence=evidence,
+                    severity=severity
+                )
+                
+                # Update booking status
+                booking.status = 'disputed'
+                booking.save(update_fields=['status', 'updated_at'])
+                
+                # Create initial system message
+                DisputeResolutionService._create_system_message(
+                    dispute,
+                    f"Dispute created by {customer_name}: {title}"
+                )
+                
+                # Create business alert
+                alert_data = {
+                    'dispute_id': str(dispute.id),
+                    'booking_id': str(booking.id),
+                    'dispute_type': dispute_type,
+                    'customer': customer_name,
+                    'vendor': vendor_name,
+                    'severity': severity
+                }
+                
+                BusinessAlert.objects.create(
+                    alert_type='dispute_created',
+                    severity=severity,
+                    title=f"New Dispute: {title}",
+                    description=f"Customer {customer_name} created a dispute for booking {booking.id}",
+                    related_booking=booking,
+                    metadata=alert_data
+                )
+                
+                # Auto-assign mediator based on dispute type and severity
+                mediator = DisputeResolutionService._auto_assign_mediator(dispute)
+                if mediator:
+                    dispute.assign_mediator(mediator)
+                
+                # Log audit trail
+                AuditLogger.log_action(
+                    user=customer,
+                    action='dispute_created',
+                    resource_type='Dispute',
+                    resource_id=str(dispute.id),
+                    new_values={'dispute_type': dispute_type, 'title': title}
+                )
+                
+                # Send notifications only once the dispute has been committed
+                transaction.on_commit(
+                    lambda: send_dispute_notifications_task.delay(str(dispute.id), 'created')
+                )
+                transaction.on_commit(
+                    lambda: AdvancedDisputeService.invalidate_history(booking.vendor_id, customer.id)
+                )
             
-            logger.info(f"Dispute created: {dispute.id} for booking {booking.id}")
+            logger.info("Dispute created: %s for booking %s", dispute.id, booking.id)
             return dispute
             
-        except Exception as e:
-            logger.error(f"Failed to create dispute: {str(e)}")
+        except Exception:
+            logger.exception("Failed to create dispute")
             return None
     
     @staticmethod
-    def _auto_assign_mediator(dispute):
-        """Auto-assign appropriate mediator based on dispute type and severity"""
+    def bulk_create_disputes(rows):
+        """
+        Create many disputes at once (imports, management scripts)
+        
+        Args:
+            rows: iterable of dicts with booking, customer, dispute_type, title,
+                  description and optional evidence keys
+        
+        Returns the list of created disputes. Bookings that already have an open
+        dispute are skipped. Each model is written with a single bulk INSERT, so
+        per-row save() side effects such as booking status notifications do not
+        run; dispute emails are queued as one batched task after commit.
+        """
         try:
-            # Get available mediators (ops managers and super admins)
-            mediators = User.objects.filter(
-                role__in=['ops_manager', 'super_admin'],
-                is_active=True
-            )
+            rows = list(rows)
+            booking_ids = [row['booking'].pk for row in rows]
+            now = timezone.now()
             
-            if not mediators.exists():
-                return None
-            
-            # Priority assignment logic
-            if dispute.severity in ['critical', 'high']:
-                # Assign to super admin first for critical/high severity
-                super_admin = mediators.filter(role='super_admin').first()
-                if super_admin:
-                    return super_admin
-            
-            # Assign to ops manager with least active disputes
-            ops_managers = mediators.filter(role='ops_manager')
-            if ops_managers.exists():
-                # Find ops manager with least active disputes
-                least_busy_manager = None
-                min_disputes = float('inf')
+            with transaction.atomic():
+                # Skip bookings that already have an open dispute, in one query
+                disputed_booking_ids = set(Dispute.objects.filter(
+                    booking_id__in=booking_ids,
+                    status__in=['open', 'investigating', 'mediation']
+                ).values_list('booking_id', flat=True))
+                
+                # Current workload per mediator, counted once for the whole batch
+                mediators = list(User.objects.filter(
+                    role__in=['ops_manager', 'super_admin'],
+                    is_active=True
+                ).annotate(
+                    active_disputes=Count(
+                        'mediated_disputes',
+                        filter=Q(mediated_disputes__status__in=_ACTIVE_MEDIATION_STATUSES)
+                    )
+                ))
                 
-                for manager in ops_managers:
-                    active_disputes = Dispute.objects.filter(
-                        assigned_mediator=manager,
-                        status__in=['investigating', 'mediation']
-                    ).count()
+                disputes = []
+                for row in rows:
+                    booking = row['booking']
+                    if booking.pk in disputed_booking_ids:
+                        continue
+                    disputed_booking_ids.add(booking.pk)
+                    
+                    dispute = Dispute(
+                        booking=booking,
+                        customer=row['customer'],
+                        vendor_id=booking.vendor_id,
+                        dispute_type=row['dispute_type'],
+                        title=row['title'],
+                        description=row['description'],
+                        customer_evidence=row.get('evidence'),
+                        severity=_SEVERITY_MAPPING.get(row['dispute_type'], 'medium')
+                    )
+                    
+                    # Same ranking as _auto_assign_mediator, over the batch-local counts
+                    preferred_role = 'super_admin' if dispute.severity in ['critical', 'high'] else 'ops_manager'
+                    mediator = min(
+                        mediators,
+                        key=lambda m: (m.role != preferred_role, m.active_disputes, m.id),
+                        default=None
+                    )
+                    if mediator:
+                        dispute.assigned_mediator = mediator
+                        dispute.assigned_at = now
+                        dispute.status = 'investigating'
+                        # Count it straight away so the rest of the batch is spread across mediators
+                        mediator.active_disputes += 1
                     
-                    if active_disputes < min_disputes:
-                        min_disputes = active_disputes
-                        least_busy_manager = manager
+                    disputes.append(dispute)
+                
+                if not disputes:
+                    return []
+                
+                Dispute.objects.bulk_create(disputes)
+                
+                Booking.objects.filter(
+                    pk__in=[dispute.booking_id for dispute in disputes]
+                ).update(status='disputed', updated_at=now)
+                
+                # Resolve every participant name once; vendors are loaded in one query
+                vendor_ids = {dispute.vendor_id for dispute in disputes if dispute.vendor_id}
+                names = {
+                    vendor.id: vendor.full_name
+                    for vendor in User.objects.filter(id__in=vendor_ids).only('id', 'first_name', 'last_name')
+                }
+                for dispute in disputes:
+                    if dispute.customer_id not in names:
+                        names[dispute.customer_id] = dispute.customer.full_name
+                
+                DisputeMessage.objects.bulk_create([
+                    DisputeMessage(
+                        dispute=dispute,
+                        sender=None,  # System messages have no sender
+                        message_type='system',
+                        content=f"Dispute created by {names[dispute.customer_id]}: {dispute.title}"
+                    )
+                    for dispute in disputes
+                ])
+                
+                BusinessAlert.objects.bulk_create([
+                    BusinessAlert(
+                        alert_type='dispute_created',
+                        severity=dispute.severity,
+                        title=f"New Dispute: {dispute.title}",
+                        description=f"Customer {names[dispute.customer_id]} created a dispute for booking {dispute.booking_id}",
+                        related_booking_id=dispute.booking_id,
+                        metadata={
+                            'dispute_id': str(dispute.id),
+                            'booking_id': str(dispute.booking_id),
+                            'dispute_type': dispute.dispute_type,
+                            'customer': names[dispute.customer_id],
+                            'vendor': names.get(dispute.vendor_id, 'N/A'),
+                            'severity': dispute.severity
+                        }
+                    )
+                    for dispute in disputes
+                ])
                 
-                return least_busy_manager
+                AuditLog.objects.bulk_create([
+                    AuditLog(
+                        user=dispute.customer,
+                        action='dispute_created',
+                        resource_type='Dispute',
+                        resource_id=str(dispute.id),
+                        new_values={'dispute_type': dispute.dispute_type, 'title': dispute.title}
+                    )
+                    for dispute in disputes
+                ])
+                
+                dispute_ids = [str(dispute.id) for dispute in disputes]
+                transaction.on_commit(
+                    lambda: send_dispute_notifications_batch_task.delay(dispute_ids, 'created')
+                )
+                for dispute in disputes:
+                    transaction.on_commit(
+                        lambda dispute=dispute: AdvancedDisputeService.invalidate_history(
+                            dispute.vendor_id, dispute.customer_id
+                        )
+                    )
             
-            # Fallback to any available mediator
-            return mediators.first()
+            logger.info("Bulk created %s disputes", len(disputes))
+            return disputes
             
-        except Exception as e:
-            logger.error(f"Failed to auto-assign mediator: {str(e)}")
+        except Exception:
+            logger.exception("Failed to bulk create disputes")
+            return []
+    
+    @staticmethod
+    def _auto_assign_mediator(dispute):
+        """Auto-assign appropriate mediator based on dispute type and severity"""
+        try:
+            # Critical/high severity disputes go to a super admin first, everything
+            # else to the least busy ops manager, falling back to the other role;
+            # returns None when no mediator is available
+            return DisputeResolutionService._rank_mediators(dispute).first()
+            
+        except Exception:
+            logger.exception("Failed to auto-assign mediator")
             return None
     
     @staticmethod
-    def add_vendor_response(dispute_id, vendor, evidence=None, response_notes=""):
+    def _rank_mediators(dispute):
+        """Active mediators ordered by role priority for the dispute's severity, then by workload"""
+        super_admin_rank = 0 if dispute.severity in ['critical', 'high'] else 1
+        
+        return User.objects.filter(
+            role__in=['ops_manager', 'super_admin'],
+            is_active=True
+        ).annotate(
+            priority=Case(
+                When(role='super_admin', then=Value(super_admin_rank)),
+                default=Value(1 - super_admin_rank)
+            ),
+            active_disputes=Count(
+                'mediated_disputes',
+                filter=Q(mediated_disputes__status__in=_ACTIVE_MEDIATION_STATUSES)
+            )
+        ).order_by('priority', 'active_disputes', 'id')
+    
+    @staticmethod
+    def add_vendor_response(dispute_or_id, vendor, evidence=None, response_notes=""):
         """Add vendor response to dispute"""
+        dispute_id = getattr(dispute_or_id, 'id', dispute_or_id)
+        if response_notes and len(response_notes) > _MAX_VENDOR_RESPONSE_LENGTH:
+            logger.warning(
+                "Vendor response to dispute %s rejected: %s characters exceeds the %s limit",
+                dispute_id, len(response_notes), _MAX_VENDOR_RESPONSE_LENGTH
+            )
+            return False
+        
         try:
-            dispute = Dispute.objects.get(id=dispute_id, vendor=vendor)
-            
-            # Update vendor evidence
-            dispute.vendor_evidence = evidence
-            
-            # Add response to resolution notes
-            timestamp = timezone.now().strftime('%Y-%m-%d %H:%M:%S')
-            vendor_response = f"\n[{timestamp}] Vendor Response:\n{response_notes}\n"
-            dispute.resolution_notes += vendor_response
+            dispute = DisputeResolutionService._get_dispute(
+                dispute_or_id,
+                Dispute.objects.select_related('customer', 'vendor', 'assigned_mediator', 'booking'),
+                vendor=vendor
+            )
             
-            dispute.save()
+            with transaction.atomic():
+                # Update vendor evidence
+                dispute.vendor_evidence = evidence
+                dispute.save(update_fields=['vendor_evidence'])
+                
+                # Record the response as its own row in the dispute thread rather than
+                # rewriting an ever-growing resolution_notes column
+                DisputeMessage.objects.create(
+                    dispute=dispute,
+                    sender=vendor,
+                    recipient=dispute.assigned_mediator,
+                    message_type='vendor_response',
+                    content=response_notes
+                )
             
             # Send notification to mediator
-            if dispute.assigned_mediator:
-                DisputeResolutionService._send_dispute_notifications(dispute, 'vendor_responded')
+            if dispute.assigned_mediator_id:
+                transaction.on_commit(
+                    lambda: send_dispute_notifications_task.delay(str(dispute.id), 'vendor_responded')
+                )
             
-            logger.info(f"Vendor response added to dispute {dispute_id}")
+            logger.info("Vendor response added to dispute %s", dispute_id)
             return True
             
         except Dispute.DoesNotExist:
-            logger.error(f"Dispute {dispute_id} not found or unauthorized")
+            logger.error("Dispute %s not found or unauthorized", dispute_id)
             return False
-        except Exception as e:
-            logger.error(f"Failed to add vendor response: {str(e)}")
+        except Exception:
+            logger.exception("Failed to add vendor response")
             return False
     
     @staticmethod
-    def resolve_dispute(dispute_id, mediator, resolution_notes, resolution_amount=None, evidence=None):
+    def resolve_dispute(dispute_or_id, mediator, resolution_notes, resolution_amount=None, evidence=None):
         """Resolve a dispute with mediator decision"""
+        dispute_id = getattr(dispute_or_id, 'id', dispute_or_id)
         try:
-            dispute = Dispute.objects.get(id=dispute_id, assigned_mediator=mediator)
+            dispute = DisputeResolutionService._get_dispute(
+                dispute_or_id,
+                Dispute.objects.select_related('customer', 'vendor', 'assigned_mediator', 'booking'),
+                assigned_mediator=mediator
+            )
             
             # Resolve the dispute
             dispute.resolve(resolution_notes, resolution_amount, evidence)
@@ -538,7 +931,7 @@ class DisputeResolutionService:
             # Create system message
             DisputeResolutionService._create_system_message(
                 dispute,
-                f"Dispute resolved by {mediator.get_full_name()}"
+                f"Dispute resolved by {mediator.full_name}"
             )
             
             # Handle payment if resolution amount is specified
@@ -546,7 +939,12 @@ class DisputeResolutionService:
                 DisputeResolutionService._process_dispute_payment(dispute, resolution_amount)
             
             # Send resolution notifications
-            DisputeResolutionService._send_dispute_notifications(dispute, 'resolved')
+            transaction.on_commit(
+                lambda: send_dispute_notifications_task.delay(str(dispute.id), 'resolved')
+            )
+            transaction.on_commit(
+                lambda: AdvancedDisputeService.invalidate_history(dispute.vendor_id, dispute.customer_id)
+            )
             
             # Log audit trail
             AuditLogger.log_action(
@@ -557,24 +955,28 @@ class DisputeResolutionService:
                 new_values={'resolution_notes': resolution_notes, 'amount': resolution_amount}
             )
             
-            logger.info(f"Dispute {dispute_id} resolved by {mediator.username}")
+            logger.info("Dispute %s resolved by %s", dispute_id, mediator.username)
             return True
             
         except Dispute.DoesNotExist:
-            logger.error(f"Dispute {dispute_id} not found or unauthorized")
+            logger.error("Dispute %s not found or unauthorized", dispute_id)
             return False
-        except Exception as e:
-            logger.error(f"Failed to resolve dispute: {str(e)}")
+        except Exception:
+            logger.exception("Failed to resolve dispute")
             return False
     
     @staticmethod
-    def escalate_dispute(dispute_id, escalated_by, escalated_to, reason):
+    def escalate_dispute(dispute_or_id, escalated_by, escalated_to, reason):
         """Escalate dispute to higher authority"""
+        dispute_id = getattr(dispute_or_id, 'id', dispute_or_id)
         try:
-            dispute = Dispute.objects.get(id=dispute_id)
+            dispute = DisputeResolutionService._get_dispute(
+                dispute_or_id,
+                Dispute.objects.select_related('customer', 'vendor', 'assigned_mediator', 'booking')
+            )
             
             # Check authorization
-            if escalated_by.role not in ['ops_manager', 'super_admin']:
+            if escalated_by.role not in DISPUTE_ADMIN_ROLES:
                 return False
             
             dispute.escalate(escalated_to, reason)
@@ -582,11 +984,13 @@ class DisputeResolutionService:
             # Create system message
             DisputeResolutionService._create_system_message(
                 dispute,
-                f"Dispute escalated to {escalated_to.get_full_name()}: {reason}"
+                f"Dispute escalated to {escalated_to.full_name}: {reason}"
             )
             
             # Send escalation notifications
-            DisputeResolutionService._send_dispute_notifications(dispute, 'escalated')
+            transaction.on_commit(
+                lambda: send_dispute_notifications_task.delay(str(dispute.id), 'escalated')
+            )
             
             # Log audit trail
             AuditLogger.log_action(
@@ -597,138 +1001,140 @@ class DisputeResolutionService:
                 new_values={'escalated_to': escalated_to.username, 'reason': reason}
             )
             
-            logger.info(f"Dispute {dispute_id} escalated to {escalated_to.username}")
+            logger.info("Dispute %s escalated to %s", dispute_id, escalated_to.username)
             return True
             
         except Dispute.DoesNotExist:
-            logger.error(f"Dispute {dispute_id} not found")
+            logger.error("Dispute %s not found", dispute_id)
             return False
-        except Exception as e:
-            logger.error(f"Failed to escalate dispute: {str(e)}")
+        except Exception:
+            logger.exception("Failed to escalate dispute")
             return False
     
+    @staticmethod
+    def _get_dispute(dispute_or_id, queryset, **lookup):
+        """
+        Return the dispute for an id, or the instance itself when the caller already has it
+        
+        A passed-in instance must satisfy the same foreign-key lookup the query
+        would apply, otherwise Dispute.DoesNotExist is raised just as for an id.
+        """
+        if isinstance(dispute_or_id, Dispute):
+            for field, value in lookup.items():
+                if getattr(dispute_or_id, f"{field}_id") != getattr(value, 'pk', value):
+                    raise Dispute.DoesNotExist
+            return dispute_or_id
+        
+        return queryset.get(id=dispute_or_id, **lookup)
+    
     @staticmethod
     def _process_dispute_payment(dispute, amount):
         """Process refund/compensation payment for dispute resolution"""
         try:
-            # This would integrate with payment service for actual refund processing
-            # For now, we'll create a payment record
-            from .models import Payment
-            
-            payment = Payment.objects.create(
+            # Written in its final state with a single INSERT.
+            # TODO: once the Stripe refund API is wired in, create the record as
+            # 'processing' and complete it from the refund callback instead.
+            Payment.objects.create(
                 booking=dispute.booking,
                 amount=amount,
-                status='processing',
+                status='completed',
                 payment_type='manual',
-                processed_by=dispute.assigned_mediator
+                processed_by=dispute.assigned_mediator,
+                processed_at=timezone.now()
             )
             
-            # In a real implementation, this would call Stripe refund API
-            payment.status = 'completed'
-            payment.processed_at = timezone.now()
-            payment.save()
-            
-            logger.info(f"Dispute resolution payment processed: ₹{amount} for dispute {dispute.id}")
+            logger.info("Dispute resolution payment processed: ₹%s for dispute %s", amount, dispute.id)
             
-        except Exception as e:
-            logger.error(f"Failed to process dispute payment: {str(e)}")
+        except Exception:
+            logger.exception("Failed to process dispute payment")
     
     @staticmethod
-    def _send_dispute_notifications(dispute, event_type):
-        """Send notifications for dispute events"""
+    def _send_dispute_notifications(dispute, event_type, connection=None):
+        """Send notifications for dispute events, optionally over a caller-owned mail connection"""
         try:
-            participants = [dispute.customer]
-            if dispute.vendor:
-                participants.append(dispute.vendor)
-            if dispute.assigned_mediator:
-                participants.append(dispute.assigned_mediator)
-            
-            subject_mapping = {
-                'created': f'Dispute Created: {dispute.title}',
-                'assigned': f'Dispute Assigned: {dispute.title}',
-                'vendor_responded': f'Vendor Response: {dispute.title}',
-                'resolved': f'Dispute Resolved: {dispute.title}',
-                'escalated': f'Dispute Escalated: {dispute.title}'
+            # Unique participants with an email address; a user holding two roles gets one email
+            participants = {}
+            for participant in (dispute.customer, dispute.vendor, dispute.assigned_mediator):
+                if participant and participant.email and participant.id not in participants:
+                    participants[participant.id] = participant
+            
+            if not participants:
+                return
+            
+            subject = _SUBJECT_TEMPLATES.get(event_type, 'Dispute Update: {title}').format(title=dispute.title)
+            
+            # Dispute-scoped body fields are computed once for all participants
+            body_context = {
+                'dispute_id': dispute.id,
+                'title': dispute.title,
+                'dispute_type': dispute.get_dispute_type_display(),
+                'status': dispute.get_status_display(),
+                'booking_id': dispute.booking_id,
+                'event': event_type.replace('_', ' ').title()
             }
             
-            subject = subject_mapping.get(event_type, f'Dispute Update: {dispute.title}')
+            # Personalized role wording keyed by participant id (customer wins if ids overlap)
+            role_contexts = {
+                dispute.vendor_id: "as the vendor involved in this dispute",
+                dispute.customer_id: "as the customer who raised this dispute",
+            }
             
-            for participant in participants:
+            datatuple = []
+            for participant in participants.values():
                 try:
-                    # Create personalized message based on role
-                    if participant == dispute.customer:
-                        role_context = "as the customer who raised this dispute"
-                    elif participant == dispute.vendor:
-                        role_context = "as the vendor involved in this dispute"
-                    else:
-                        role_context = "as the assigned mediator"
-                    
-                    message = f"""
-                    Hello {participant.get_full_name()},
-                    
-                    There has been an update to dispute {dispute.id} {role_context}.
-                    
-                    Dispute Details:
-                    - Title: {dispute.title}
-                    - Type: {dispute.get_dispute_type_display()}
-                    - Status: {dispute.get_status_display()}
-                    - Booking: {dispute.booking.id}
-                    
-                    Event: {event_type.replace('_', ' ').title()}
-                    
-                    Please log in to your dashboard to view more details.
-                    
-                    Best regards,
-                    HomeServe Pro Team
-                    """
-                    
-                    # Send email notification
-                    from django.core.mail import send_mail
-                    from django.conf import settings
-                    
-                    send_mail(
-                        subject=subject,
-                        message=message,
-                        from_email=settings.DEFAULT_FROM_EMAIL,
-                        recipient_list=[participant.email],
-                        fail_silently=True
+                    message = _NOTIFICATION_BODY.substitute(
+                        body_context,
+                        name=participant.full_name,
+                        role_context=role_contexts.get(participant.id, "as the assigned mediator")
                     )
                     
-                except Exception as participant_error:
-                    logger.error(f"Failed to send dispute notification to {participant.email}: {str(participant_error)}")
+                    datatuple.append((subject, message, settings.DEFAULT_FROM_EMAIL, [participant.email]))
+                    
+                except Exception:
+                    logger.exception("Failed to build dispute notification for %s", participant.email)
                     continue
             
-        except Exception as e:
-            logger.error(f"Failed to send dispute notifications: {str(e)}")
+            # Send all emails over a single SMTP connection
+            send_mass_mail(tuple(datatuple), fail_silently=True, connection=connection)
+            
+        except Exception:
+            logger.exception("Failed to send dispute notifications")
     
     @staticmethod
-    def send_message(dispute_id, sender, content, message_type='text', attachment=None, recipient=None):
+    def send_message(dispute_or_id, sender, content, message_type='text', attachment=None, recipient=None):
         """Send a message in a dispute"""
         try:
-            dispute = Dispute.objects.get(id=dispute_id)
+            # Party ids are enough for the permission check and recipient resolution
+            dispute = DisputeResolutionService._get_dispute(
+                dispute_or_id,
+                Dispute.objects.only(
+                    'customer_id', 'vendor_id', 'assigned_mediator_id', 'status', 'title', 'booking_id'
+                )
+            )
 
             # Check permissions
-            if sender not in [dispute.customer, dispute.vendor, dispute.assigned_mediator] and \
-               sender.role not in ['ops_manager', 'super_admin']:
+            if sender.id not in (dispute.customer_id, dispute.vendor_id, dispute.assigned_mediator_id) and \
+               sender.role not in DISPUTE_ADMIN_ROLES:
                 return {
                     'success': False,
                     'error': 'Unauthorized to send messages in this dispute'
                 }
 
             # Determine recipient
-            if not recipient:
-                if sender == dispute.customer:
-                    recipient = dispute.vendor or dispute.assigned_mediator
-                elif sender == dispute.vendor:
-                    recipient = dispute.customer or dispute.assigned_mediator
-                else:
-                    # Mediator/admin sending message
-                    recipient = dispute.customer if dispute.customer != sender else dispute.vendor
+            if recipient:
+                recipient_id = recipient.id
+            elif sender.id == dispute.customer_id:
+                recipient_id = dispute.vendor_id or dispute.assigned_mediator_id
+            elif sender.id == dispute.vendor_id:
+                recipient_id = dispute.customer_id or dispute.assigned_mediator_id
+            else:
+                # Mediator/admin sending message
+                recipient_id = dispute.customer_id if dispute.customer_id != sender.id else dispute.vendor_id
 
             message = DisputeMessage.objects.create(
                 dispute=dispute,
                 sender=sender,
-                recipient=recipient,
+                recipient_id=recipient_id,
                 message_type=message_type,
                 content=content,
                 attachment=attachment
@@ -737,10 +1143,10 @@ class DisputeResolutionService:
             # Mark dispute as active if it was resolved
             if dispute.status == 'resolved':
                 dispute.status = 'open'
-                dispute.save()
+                dispute.save(update_fields=['status'])
 
             # Send real-time notification
-            DisputeResolutionService._notify_message_sent(message)
+            transaction.on_commit(lambda: notify_message_sent_task.delay(message.id))
 
             return {
                 'success': True,
@@ -753,7 +1159,7 @@ class DisputeResolutionService:
                 'error': 'Dispute not found'
             }
         except Exception as e:
-            logger.error(f"Failed to send message: {str(e)}")
+            logger.exception("Failed to send message")
             return {
                 'success': False,
                 'error': str(e)
@@ -763,28 +1169,24 @@ class DisputeResolutionService:
     def mark_messages_read(dispute_id, user):
         """Mark all unread messages in a dispute as read for a user"""
         try:
-            dispute = Dispute.objects.get(id=dispute_id)
-
             # Check if user is party to this dispute
-            if user not in [dispute.customer, dispute.vendor, dispute.assigned_mediator] and \
-               user.role not in ['ops_manager', 'super_admin']:
+            if not DisputeResolutionService._user_can_access_dispute(dispute_id, user):
                 return {
                     'success': False,
                     'error': 'Unauthorized to view this dispute'
                 }
 
-            unread_messages = DisputeMessage.objects.filter(
-                dispute=dispute,
+            # Single UPDATE instead of one save() per message
+            now = timezone.now()
+            marked_count = DisputeMessage.objects.filter(
+                dispute_id=dispute_id,
                 recipient=user,
                 is_read=False
-            )
-
-            for message in unread_messages:
-                message.mark_as_read(user)
+            ).update(is_read=True, read_at=now, updated_at=now)
 
             return {
                 'success': True,
-                'marked_count': unread_messages.count()
+                'marked_count': marked_count
             }
 
         except Dispute.DoesNotExist:
@@ -793,40 +1195,67 @@ class DisputeResolutionService:
                 'error': 'Dispute not found'
             }
         except Exception as e:
-            logger.error(f"Failed to mark messages as read: {str(e)}")
+            logger.exception("Failed to mark messages as read")
             return {
                 'success': False,
                 'error': str(e)
             }
 
     @staticmethod
-    def get_dispute_messages(dispute_id, user, page=1, page_size=50):
-        """Get paginated messages for a dispute"""
+    def get_dispute_messages(dispute_id, user, page=1, page_size=50, before_id=None, include_total=True):
+        """
+        Get paginated messages for a dispute, newest first
+        
+        Pass before_id (the next_cursor of the previous page) for keyset pagination,
+        which seeks past the cursor instead of scanning and discarding OFFSET rows.
+        has_more never needs a COUNT; pass include_total=False to skip the
+        total_count query as well (it is then None).
+        """
         try:
-            dispute = Dispute.objects.get(id=dispute_id)
-
             # Check permissions
-            if user not in [dispute.customer, dispute.vendor, dispute.assigned_mediator] and \
-               user.role not in ['ops_manager', 'super_admin']:
+            if not DisputeResolutionService._user_can_access_dispute(dispute_id, user):
                 return {
                     'success': False,
                     'error': 'Unauthorized to view this dispute'
                 }
 
-            messages = DisputeMessage.objects.filter(dispute=dispute).order_by('-created_at')
+            # Sender/recipient names and DisputeMessageSerializer's dispute title come from the same JOIN
+            messages = DisputeMessage.objects.filter(
+                dispute_id=dispute_id
+            ).select_related('sender', 'recipient', 'dispute').order_by('-created_at', '-id')
 
-            # Pagination
-            start = (page - 1) * page_size
-            end = start + page_size
-            paginated_messages = messages[start:end]
+            if before_id:
+                # Keyset pagination on (created_at, id) of the cursor message
+                cursor_created_at = Subquery(
+                    DisputeMessage.objects.filter(id=before_id, dispute_id=dispute_id).values('created_at')[:1]
+                )
+                page_messages = messages.filter(
+                    Q(created_at__lt=cursor_created_at) |
+                    Q(created_at=cursor_created_at, id__lt=before_id)
+                )
+                start = 0
+            else:
+                page_messages = messages
+                start = (page - 1) * page_size
+
+            # Fetch one extra row to know whether another page exists
+            if start:
+                # Deep OFFSET pages skip over ids from the index only, then load just the page's rows
+                page_ids = list(page_messages.values_list('id', flat=True)[start:start + page_size + 1])
+                paginated_messages = list(messages.filter(id__in=page_ids))
+            else:
+                paginated_messages = list(page_messages[:page_size + 1])
+            has_more = len(paginated_messages) > page_size
+            paginated_messages = paginated_messages[:page_size]
 
             return {
                 'success': True,
-                'messages': list(paginated_messages),
-                'total_count': messages.count(),
+                'messages': paginated_messages,
+                'total_count': messages.count() if include_total else None,
                 'page': page,
                 'page_size': page_size,
-                'has_more': messages.count() > end
+                'has_more': has_more,
+                'next_cursor': paginated_messages[-1].id if has_more else None
             }
 
         except Dispute.DoesNotExist:
@@ -835,24 +1264,60 @@ class DisputeResolutionService:
                 'error': 'Dispute not found'
             }
         except Exception as e:
-            logger.error(f"Failed to get dispute messages: {str(e)}")
+            logger.exception("Failed to get dispute messages")
             return {
                 'success': False,
                 'error': str(e)
             }
 
+    @staticmethod
+    def _user_can_access_dispute(dispute_id, user):
+        """
+        Check whether the user may read a dispute's thread
+        
+        Party membership is computed in the same single-row query that confirms
+        the dispute exists, so no Dispute or related User rows are loaded.
+        Raises Dispute.DoesNotExist when there is no such dispute.
+        """
+        # is_party is NULL rather than false when a party column is NULL, so the
+        # row's pk is what tells a missing dispute apart
+        row = Dispute.objects.filter(id=dispute_id).annotate(
+            is_party=ExpressionWrapper(
+                Q(customer=user) | Q(vendor=user) | Q(assigned_mediator=user),
+                output_field=BooleanField()
+            )
+        ).values_list('pk', 'is_party').first()
+        if row is None:
+            raise Dispute.DoesNotExist(f"Dispute {dispute_id} not found")
+        return bool(row[1]) or user.role in DISPUTE_ADMIN_ROLES
+
     @staticmethod
     def _create_system_message(dispute, content):
         """Create a system message in the dispute"""
+        DisputeResolutionService._create_system_messages(dispute, [content])
+    
+    @staticmethod
+    def _create_system_messages(dispute, contents):
+        """
+        Create several system messages in the dispute
+        
+        The messages are written with multi-row INSERTs in the caller's transaction,
+        so they commit or roll back together with the dispute change.
+        """
         try:
-            DisputeMessage.objects.create(
-                dispute=dispute,
-                sender=None,  # System messages have no sender
-                message_type='system',
-                content=content
-            )
-        except Exception as e:
-            logger.error(f"Failed to create system message: {str(e)}")
+            # Savepoint so a failed insert does not abort the caller's transaction
+            with transaction.atomic():
+                DisputeMessage.objects.bulk_create([
+                    DisputeMessage(
+                        dispute=dispute,
+                        sender=None,  # System messages have no sender
+                        message_type='system',
+                        content=content
+                    )
+                    for content in contents
+                ], batch_size=_SYSTEM_MESSAGE_BATCH_SIZE)
+        except Exception:
+            logger.exception("Failed to create %s system messages", len(contents))
 
     @staticmethod
     def _notify_message_sent(message):
@@ -867,11 +1332,11 @@ class DisputeResolutionService:
                     metadata={
                         'dispute_id': str(message.dispute.id),
                         'message_id': str(message.id),
-                        'sender_name': message.sender.get_full_name() if message.sender else 'System'
+                        'sender_name': message.sender.full_name if message.sender else 'System'
                     }
                 )
-        except Exception as e:
-            logger.error(f"Failed to notify message: {str(e)}")
+        except Exception:
+            logger.exception("Failed to notify message")
 
 
 # Singleton instance
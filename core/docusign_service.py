@@ -1,25 +1,71 @@
 import base64
 import json
+import asyncio
+import weakref
 from django.conf import settings
 from django.utils import timezone
+from django.db import transaction
 from .models import Signature, Booking
 import logging
 
 logger = logging.getLogger(__name__)
 
+# orjson parses webhook bodies straight from bytes and is considerably faster; it is optional
 try:
-    from docusign_esign import ApiClient, EnvelopesApi, EnvelopeDefinition, Document, Signer, SignHere, Tabs, Recipients
-    DOCUSIGN_AVAILABLE = True
+    from orjson import loads as _json_loads
 except ImportError:
-    DOCUSIGN_AVAILABLE = False
-    logger.warning("DocuSign SDK not available. Install docusign-esign to enable DocuSign integration.")
+    _json_loads = json.loads
+
+# The SDK pulls in hundreds of generated model modules, so it is imported on first use
+# rather than at Django startup; see _load_sdk()
+_sdk = None
+
+
+def _load_sdk():
+    """Import docusign_esign once and cache the module; None if it is not installed"""
+    global _sdk
+    if _sdk is None:
+        try:
+            import docusign_esign
+        except ImportError:
+            logger.warning("DocuSign SDK not available. Install docusign-esign to enable DocuSign integration.")
+            return None
+        _sdk = docusign_esign
+    return _sdk
+
+
+# Satisfaction confirmation document; only the booking fields are filled in per envelope
+_DOCUMENT_TEMPLATE = """
+        SERVICE SATISFACTION CONFIRMATION
+        
+        Booking ID: {booking_id}
+        Service: {service_name}
+        Date: {scheduled_date}
+        Vendor: {vendor_name}
+        
+        Service Details:
+        {service_description}
+        
+        Customer Declaration:
+        
+        I confirm that the service was completed to my satisfaction and I am happy with the work performed.
+        I understand that by signing this document, I am confirming my satisfaction with the service and
+        authorizing payment to be released to the service provider.
+        
+        Customer Name: ________________________________
+        
+        Signature: ________________________________
+        
+        Date: ________________________________
+        """
 
 
 class DocuSignService:
     """Service for handling DocuSign integration"""
     
     def __init__(self):
-        if not DOCUSIGN_AVAILABLE:
+        self.sdk = _load_sdk()
+        if self.sdk is None:
             raise Exception("DocuSign SDK not available. Please install docusign-esign package.")
             
         self.client_id = getattr(settings, 'DOCUSIGN_CLIENT_ID', '')
@@ -31,6 +77,21 @@ class DocuSignService:
         # Check if required settings are available
         if not all([self.client_id, self.client_secret, self.account_id]):
             raise Exception("DocuSign configuration is incomplete. Please check your environment variables.")
+        
+        # One client per service instance so its urllib3 pool keeps connections (and TLS
+        # sessions) alive across calls; get_docusign_service() keeps the instance for the process
+        self.api_client = self.sdk.ApiClient()
+        self.api_client.host = self.base_path
+        
+        # TODO: Add proper authentication here
+        # This is a placeholder - in production, you would need to implement OAuth2 authentication
+        # self.api_client.set_default_header("Authorization", "Bearer " + access_token)
+        
+        self.envelopes_api = self.sdk.EnvelopesApi(self.api_client)
+        
+        # aiohttp sessions for get_envelope_status_async, one per event loop: a session
+        # is bound to the loop it was created in and cannot be used from another
+        self._http_sessions = weakref.WeakKeyDictionary()
     
     def create_signature_envelope(self, booking, customer_email, customer_name):
         """
@@ -38,7 +99,7 @@ class DocuSignService:
         """
         try:
             # Create envelope definition
-            envelope_definition = EnvelopeDefinition(
+            envelope_definition = self.sdk.EnvelopeDefinition(
                 email_subject=f"Service Satisfaction Confirmation - Booking {booking.id}"
             )
             
@@ -46,7 +107,7 @@ class DocuSignService:
             document_content = self._generate_document_content(booking)
             
             # Add document to envelope
-            document = Document(
+            document = self.sdk.Document(
                 document_base64=base64.b64encode(document_content.encode('utf-8')).decode('ascii'),
                 name="Service Satisfaction Confirmation",
                 file_extension="pdf",
@@ -55,7 +116,7 @@ class DocuSignService:
             envelope_definition.documents = [document]
             
             # Add signer
-            signer = Signer(
+            signer = self.sdk.Signer(
                 email=customer_email,
                 name=customer_name,
                 recipient_id="1",
@@ -63,7 +124,7 @@ class DocuSignService:
             )
             
             # Add signature tab
-            sign_here = SignHere(
+            sign_here = self.sdk.SignHere(
                 document_id="1",
                 page_number="1",
                 recipient_id="1",
@@ -72,21 +133,12 @@ class DocuSignService:
                 y_position="200"
             )
             
-            signer.tabs = Tabs(sign_here_tabs=[sign_here])
-            envelope_definition.recipients = Recipients(signers=[signer])
+            signer.tabs = self.sdk.Tabs(sign_here_tabs=[sign_here])
+            envelope_definition.recipients = self.sdk.Recipients(signers=[signer])
             envelope_definition.status = "sent"
             
-            # Create API client
-            api_client = ApiClient()
-            api_client.host = self.base_path
-            
-            # TODO: Add proper authentication here
-            # This is a placeholder - in production, you would need to implement OAuth2 authentication
-            # api_client.set_default_header("Authorization", "Bearer " + access_token)
-            
             # Create envelope
-            envelopes_api = EnvelopesApi(api_client)
-            results = envelopes_api.create_envelope(self.account_id, envelope_definition=envelope_definition)
+            results = self.envelopes_api.create_envelope(self.account_id, envelope_definition=envelope_definition)
             
             logger.info(f"DocuSign envelope created successfully for booking {booking.id}")
             return results.envelope_id
@@ -99,42 +151,20 @@ class DocuSignService:
         """
         Generate the PDF document content for the signature request
         """
-        content = f"""
-        SERVICE SATISFACTION CONFIRMATION
-        
-        Booking ID: {booking.id}
-        Service: {booking.service.name}
-        Date: {booking.scheduled_date.strftime('%Y-%m-%d %H:%M') if booking.scheduled_date else 'N/A'}
-        Vendor: {booking.vendor.get_full_name() if booking.vendor else 'N/A'}
-        
-        Service Details:
-        {booking.service.description if booking.service.description else 'No description available'}
-        
-        Customer Declaration:
-        
-        I confirm that the service was completed to my satisfaction and I am happy with the work performed.
-        I understand that by signing this document, I am confirming my satisfaction with the service and
-        authorizing payment to be released to the service provider.
-        
-        Customer Name: ________________________________
-        
-        Signature: ________________________________
-        
-        Date: ________________________________
-        """
-        return content
+        return _DOCUMENT_TEMPLATE.format(
+            booking_id=booking.id,
+            service_name=booking.service.name,
+            scheduled_date=booking.scheduled_date.strftime('%Y-%m-%d %H:%M') if booking.scheduled_date else 'N/A',
+            vendor_name=booking.vendor.get_full_name() if booking.vendor else 'N/A',
+            service_description=booking.service.description or 'No description available'
+        )
     
     def get_envelope_status(self, envelope_id):
         """
         Get the status of a DocuSign envelope
         """
         try:
-            api_client = ApiClient()
-            api_client.host = self.base_path
-            
-            # TODO: Add proper authentication here
-            envelopes_api = EnvelopesApi(api_client)
-            envelope = envelopes_api.get_envelope(self.account_id, envelope_id)
+            envelope = self.envelopes_api.get_envelope(self.account_id, envelope_id)
             
             return {
                 'status': envelope.status,
@@ -148,14 +178,62 @@ class DocuSignService:
             logger.error(f"Failed to get envelope status for {envelope_id}: {str(e)}")
             raise
     
+    async def get_envelope_status_async(self, envelope_id):
+        """
+        Get the status of a DocuSign envelope without blocking the event loop
+        
+        For ASGI views and Channels consumers: calls the REST endpoint directly with
+        aiohttp instead of the SDK's blocking urllib3 client, reusing one session
+        (and its keep-alive connections) per event loop until close_http_session().
+        """
+        try:
+            session = await self._get_http_session()
+            url = f"{self.base_path}/v2.1/accounts/{self.account_id}/envelopes/{envelope_id}"
+            
+            # Same headers as the SDK client, so authentication added there applies here too
+            async with session.get(url, headers=self.api_client.default_headers) as response:
+                response.raise_for_status()
+                envelope = await response.json()
+            
+            return {
+                'status': envelope.get('status'),
+                'envelope_id': envelope.get('envelopeId'),
+                'created_date': envelope.get('createdDateTime'),
+                'sent_date': envelope.get('sentDateTime'),
+                'completed_date': envelope.get('completedDateTime')
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to get envelope status for {envelope_id}: {str(e)}")
+            raise
+    
+    async def _get_http_session(self):
+        """aiohttp session for the running event loop, created on first use and replaced if closed"""
+        import aiohttp
+        
+        loop = asyncio.get_running_loop()
+        session = self._http_sessions.get(loop)
+        if session is None or session.closed:
+            session = self._http_sessions[loop] = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=50),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return session
+    
+    async def close_http_session(self):
+        """Close the running event loop's HTTP session; called on ASGI lifespan shutdown"""
+        session = self._http_sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+    
     def handle_webhook_event(self, payload):
         """
         Handle DocuSign webhook events
         """
         try:
-            # Parse webhook payload
-            if isinstance(payload, str):
-                payload = json.loads(payload)
+            # Parse webhook payload (raw request bodies arrive as bytes)
+            if isinstance(payload, (bytes, str)):
+                payload = _json_loads(payload)
             
             envelope_id = payload.get('envelopeId')
             status = payload.get('status')
@@ -165,12 +243,16 @@ class DocuSignService:
             
             # Find signature by DocuSign envelope ID
             try:
-                signature = Signature.objects.get(docusign_envelope_id=envelope_id)
+                # The booking parties and service are read for signature_data and the WebSocket notification
+                signature = Signature.objects.select_related(
+                    'booking__customer', 'booking__vendor', 'booking__service'
+                ).get(docusign_envelope_id=envelope_id)
                 
                 # Update signature based on envelope status
                 if status == 'completed' or envelope_status == 'completed':
                     signature.status = 'signed'
                     signature.signed_at = timezone.now()
+                    signature.signed_by_id = signature.booking.customer_id
                     
                     # Store comprehensive signature data for hashing
                     signature.signature_data = {
@@ -184,23 +266,27 @@ class DocuSignService:
                         'envelope_status': status
                     }
                     
-                    signature.save()  # This will generate the SHA-256 hash
+                    # save() generates the SHA-256 hash, so it is written alongside the signed fields
+                    signature.save(update_fields=[
+                        'status', 'signed_at', 'signed_by', 'signature_data', 'signature_hash'
+                    ])
                     
-                    # Trigger automatic payment processing
-                    from .payment_service import PaymentService
-                    PaymentService.process_automatic_payment(signature.booking)
+                    # Capture the payment in a worker so the webhook is acknowledged right away
+                    from .tasks import process_automatic_payment_task
+                    booking_id = str(signature.booking_id)
+                    transaction.on_commit(lambda: process_automatic_payment_task.delay(booking_id))
                     
                     logger.info(f"Signature {signature.id} marked as signed via DocuSign")
                     
                 elif status == 'declined' or envelope_status == 'declined':
                     signature.status = 'rejected'
-                    signature.save()
+                    Signature.objects.filter(pk=signature.pk).update(status=signature.status)
                     
                     logger.info(f"Signature {signature.id} marked as rejected via DocuSign")
                     
                 elif status == 'voided' or envelope_status == 'voided':
                     signature.status = 'expired'
-                    signature.save()
+                    Signature.objects.filter(pk=signature.pk).update(status=signature.status)
                     
                     logger.info(f"Signature {signature.id} marked as expired via DocuSign")
                 
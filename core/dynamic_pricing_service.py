@@ -3,15 +3,74 @@ Advanced Dynamic Pricing Service
 Calculates real-time prices based on demand, supply density, and market conditions
 """
 
-from decimal import Decimal
+from bisect import bisect_right
 from datetime import datetime, timedelta
 from django.utils import timezone
-from django.db.models import Count, Avg, Q
+from django.db.models import Count, Avg, Q, Sum
 from django.core.cache import cache
 import logging
+import threading
+import time
+
+from .models import Booking, PincodeAnalytics, User
 
 logger = logging.getLogger(__name__)
 
+# Generation of the pricing cache keys (passed as the cache `version`); clear_cache()
+# without a pincode bumps it, which orphans every pincode's entries at once
+PRICING_CACHE_VERSION_KEY = 'pricing_cache_version'
+
+# Process-local cache in front of the shared one: cache key -> (expires_at, data).
+# Pricing is requested most during demand spikes, when the same pincodes are hit
+# over and over, so a short local TTL absorbs most shared-cache round-trips.
+_LOCAL_CACHE = {}
+_LOCAL_CACHE_TTLS = {
+    'demand_data': 30,
+    'supply_data': 30,
+    'performance_data': 300,
+}
+_LOCAL_CACHE_MAX_ENTRIES = 10000
+_local_cache_lock = threading.Lock()
+
+# This process's copy of the shared pricing cache version: (expires_at, version)
+_PRICING_CACHE_VERSION_TTL = 30
+_pricing_cache_version = (0.0, None)
+
+
+def _local_cache_get(key):
+    entry = _LOCAL_CACHE.get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _local_cache_set(key, data):
+    now = time.monotonic()
+    if len(_LOCAL_CACHE) >= _LOCAL_CACHE_MAX_ENTRIES:
+        with _local_cache_lock:
+            for stale_key in [k for k, (expires_at, _) in list(_LOCAL_CACHE.items()) if expires_at <= now]:
+                _LOCAL_CACHE.pop(stale_key, None)
+            if len(_LOCAL_CACHE) >= _LOCAL_CACHE_MAX_ENTRIES:
+                _LOCAL_CACHE.clear()
+    _LOCAL_CACHE[key] = (now + _LOCAL_CACHE_TTLS[key.rsplit('_', 1)[0]], data)
+
+
+def _get_pricing_cache_version():
+    expires_at, version = _pricing_cache_version
+    if version is None or expires_at <= time.monotonic():
+        version = cache.get(PRICING_CACHE_VERSION_KEY)
+        if version is None:
+            # Seed from the clock so a lost key never brings back an older generation
+            cache.add(PRICING_CACHE_VERSION_KEY, int(time.time()), None)
+            version = cache.get(PRICING_CACHE_VERSION_KEY)
+        _set_pricing_cache_version(version)
+    return version
+
+
+def _set_pricing_cache_version(version):
+    global _pricing_cache_version
+    _pricing_cache_version = (time.monotonic() + _PRICING_CACHE_VERSION_TTL, version)
+
 
 class DynamicPricingService:
     """
@@ -23,40 +82,59 @@ class DynamicPricingService:
     """
     
     # Base multipliers
-    BASE_MULTIPLIER = Decimal('1.0')
+    BASE_MULTIPLIER = 1.0
     
     # Demand-based multipliers
     DEMAND_MULTIPLIERS = {
-        'very_low': Decimal('0.85'),    # < 1 booking per vendor - discount
-        'low': Decimal('0.95'),          # 1-2 bookings per vendor
-        'normal': Decimal('1.0'),        # 2-3 bookings per vendor
-        'high': Decimal('1.15'),         # 3-5 bookings per vendor
-        'very_high': Decimal('1.30'),    # 5-8 bookings per vendor
-        'extreme': Decimal('1.50'),      # > 8 bookings per vendor
+        'very_low': 0.85,    # < 1 booking per vendor - discount
+        'low': 0.95,          # 1-2 bookings per vendor
+        'normal': 1.0,        # 2-3 bookings per vendor
+        'high': 1.15,         # 3-5 bookings per vendor
+        'very_high': 1.30,    # 5-8 bookings per vendor
+        'extreme': 1.50,      # > 8 bookings per vendor
     }
     
+    # Demand level for a bookings-per-vendor ratio: DEMAND_LEVELS[i] covers
+    # ratios below DEMAND_RATIO_THRESHOLDS[i]
+    DEMAND_RATIO_THRESHOLDS = (1, 2, 3, 5, 8)
+    DEMAND_LEVELS = ('very_low', 'low', 'normal', 'high', 'very_high', 'extreme')
+    
+    # Demand ratio reported when no vendors are available; lands in 'extreme'
+    NO_VENDOR_DEMAND_RATIO = 999.0
+    
     # Supply density multipliers
     SUPPLY_MULTIPLIERS = {
-        'no_vendors': Decimal('2.0'),    # 0 vendors available - emergency pricing
-        'very_low': Decimal('1.40'),     # 1 vendor available
-        'low': Decimal('1.20'),          # 2-3 vendors available
-        'normal': Decimal('1.0'),        # 4-6 vendors available
-        'good': Decimal('0.90'),         # 7-10 vendors available
-        'excellent': Decimal('0.85'),    # > 10 vendors available
+        'no_vendors': 2.0,    # 0 vendors available - emergency pricing
+        'very_low': 1.40,     # 1 vendor available
+        'low': 1.20,          # 2-3 vendors available
+        'normal': 1.0,        # 4-6 vendors available
+        'good': 0.90,         # 7-10 vendors available
+        'excellent': 0.85,    # > 10 vendors available
     }
     
+    # Supply level for an effective vendor count: SUPPLY_LEVELS[i] covers
+    # counts below SUPPLY_VENDOR_THRESHOLDS[i]
+    SUPPLY_VENDOR_THRESHOLDS = (1, 2, 4, 7, 11)
+    SUPPLY_LEVELS = ('no_vendors', 'very_low', 'low', 'normal', 'good', 'excellent')
+    
     # Time-based multipliers
-    PEAK_HOUR_MULTIPLIER = Decimal('1.10')     # Peak hours (5 PM - 9 PM)
-    WEEKEND_MULTIPLIER = Decimal('1.15')       # Saturday, Sunday
-    LATE_NIGHT_MULTIPLIER = Decimal('1.25')    # 10 PM - 6 AM
-    EARLY_MORNING_MULTIPLIER = Decimal('1.10') # 6 AM - 8 AM
+    PEAK_HOUR_MULTIPLIER = 1.10     # Peak hours (5 PM - 9 PM)
+    WEEKEND_MULTIPLIER = 1.15       # Saturday, Sunday
+    LATE_NIGHT_MULTIPLIER = 1.25    # 10 PM - 6 AM
+    EARLY_MORNING_MULTIPLIER = 1.10 # 6 AM - 8 AM
     
     # Performance-based adjustments
-    HIGH_SATISFACTION_DISCOUNT = Decimal('0.98')  # Area with >4.5 avg rating
-    LOW_COMPLETION_SURCHARGE = Decimal('1.05')    # Area with <70% completion
+    HIGH_SATISFACTION_DISCOUNT = 0.98  # Area with >4.5 avg rating
+    LOW_COMPLETION_SURCHARGE = 1.05    # Area with <70% completion
     
     # Seasonal/promotional adjustments
-    PROMOTIONAL_DISCOUNT = Decimal('0.90')  # Can be toggled for marketing campaigns
+    PROMOTIONAL_DISCOUNT = 0.90  # Can be toggled for marketing campaigns
+    
+    # Lazily built by _time_slot_table()
+    _TIME_SLOT_TABLE = None
+    
+    # Times of day quoted by get_price_prediction
+    PREDICTION_SLOTS = (('morning', 9), ('afternoon', 14), ('evening', 18))
     
     @classmethod
     def calculate_dynamic_price(cls, service, pincode, scheduled_datetime=None):
@@ -72,64 +150,63 @@ class DynamicPricingService:
             dict with price breakdown and final price
         """
         try:
-            # Start with base price
-            base_price = Decimal(str(service.base_price))
+            # Start with base price; the multipliers are plain floats and only
+            # the final price is rounded, to the paisa
+            base_price = float(service.base_price)
             
             # Use current time if no scheduled time provided
             if not scheduled_datetime:
                 scheduled_datetime = timezone.now()
             
             # Get real-time analytics
-            demand_data = cls._get_demand_data(pincode)
-            supply_data = cls._get_supply_data(pincode)
-            time_factors = cls._get_time_factors(scheduled_datetime)
-            performance_data = cls._get_performance_data(pincode)
+            prefetched = cls._get_all_cached(pincode)
+            demand_data = cls._get_demand_data(pincode, prefetched)
+            supply_data = cls._get_supply_data(pincode, prefetched)
+            time_factors, time_multiplier = cls._get_time_slot(scheduled_datetime)
+            performance_data = cls._get_performance_data(pincode, prefetched)
             
             # Calculate multipliers
             demand_multiplier = cls._calculate_demand_multiplier(demand_data)
             supply_multiplier = cls._calculate_supply_multiplier(supply_data)
-            time_multiplier = cls._calculate_time_multiplier(time_factors)
             performance_multiplier = cls._calculate_performance_multiplier(performance_data)
             
             # Apply multipliers
-            final_price = base_price * demand_multiplier * supply_multiplier * time_multiplier * performance_multiplier
-            
-            # Round to 2 decimal places
-            final_price = final_price.quantize(Decimal('0.01'))
+            total_multiplier = demand_multiplier * supply_multiplier * time_multiplier * performance_multiplier
+            final_price = cls._round_price(base_price * total_multiplier)
             
             # Calculate percentage change
-            price_change_percent = ((final_price - base_price) / base_price * 100).quantize(Decimal('0.1'))
+            price_change_percent = round((final_price - base_price) / base_price * 100, 1)
             
             # Build breakdown
             breakdown = {
-                'base_price': float(base_price),
-                'final_price': float(final_price),
-                'price_change_percent': float(price_change_percent),
+                'base_price': base_price,
+                'final_price': final_price,
+                'price_change_percent': price_change_percent,
                 'factors': {
                     'demand': {
                         'level': demand_data['level'],
-                        'multiplier': float(demand_multiplier),
+                        'multiplier': demand_multiplier,
                         'details': demand_data
                     },
                     'supply': {
                         'level': supply_data['level'],
-                        'multiplier': float(supply_multiplier),
+                        'multiplier': supply_multiplier,
                         'details': supply_data
                     },
                     'time': {
                         'factors': time_factors,
-                        'multiplier': float(time_multiplier)
+                        'multiplier': time_multiplier
                     },
                     'performance': {
-                        'multiplier': float(performance_multiplier),
+                        'multiplier': performance_multiplier,
                         'details': performance_data
                     }
                 },
-                'total_multiplier': float(demand_multiplier * supply_multiplier * time_multiplier * performance_multiplier),
+                'total_multiplier': total_multiplier,
                 'surge_info': cls._get_surge_info(demand_data, supply_data, time_factors)
             }
             
-            logger.info(f"Dynamic price calculated for {service.name} in {pincode}: ₹{base_price} -> ₹{final_price}")
+            logger.info(f"Dynamic price calculated for {service.name} in {pincode}: ₹{base_price:.2f} -> ₹{final_price:.2f}")
             
             return breakdown
             
@@ -143,6 +220,11 @@ class DynamicPricingService:
                 'error': str(e)
             }
     
+    @staticmethod
+    def _round_price(price):
+        """Round a price to the paisa"""
+        return round(price * 100) / 100
+    
     @classmethod
     def _get_surge_info(cls, demand_data, supply_data, time_factors):
         """Get surge pricing information for customer notifications"""
@@ -189,13 +271,35 @@ class DynamicPricingService:
         }
     
     @classmethod
-    def _get_demand_data(cls, pincode):
+    def _get_all_cached(cls, pincode):
+        """Fetch the cached demand, supply and performance data in one round-trip"""
+        return cls._cache_get_many(cls._pricing_cache_keys(pincode))
+    
+    @staticmethod
+    def _cache_get_many(keys):
+        """Read pricing data from the local cache, falling back to the shared cache"""
+        found = {}
+        missing = []
+        for key in keys:
+            data = _local_cache_get(key)
+            if data is None:
+                missing.append(key)
+            else:
+                found[key] = data
+        
+        if missing:
+            shared = cache.get_many(missing, version=_get_pricing_cache_version())
+            for key, data in shared.items():
+                _local_cache_set(key, data)
+            found.update(shared)
+        return found
+    
+    @classmethod
+    def _get_demand_data(cls, pincode, prefetched=None):
         """Get real-time demand data for pincode"""
-        from .models import PincodeAnalytics, Booking
-        
         # Try to get from cache first
         cache_key = f"demand_data_{pincode}"
-        cached_data = cache.get(cache_key)
+        cached_data = (prefetched if prefetched is not None else cls._cache_get_many([cache_key])).get(cache_key)
         if cached_data:
             return cached_data
         
@@ -207,65 +311,53 @@ class DynamicPricingService:
         ).first()
         
         if analytics:
-            demand_ratio = analytics.demand_ratio
             total_bookings = analytics.total_bookings
             pending_bookings = analytics.pending_bookings
+            available_vendors = analytics.available_vendors
         else:
             # Calculate on the fly
-            total_bookings = Booking.objects.filter(
+            booking_counts = Booking.objects.filter(
                 pincode=pincode,
                 created_at__date=today
-            ).count()
-            
-            pending_bookings = Booking.objects.filter(
-                pincode=pincode,
-                status='pending',
-                created_at__date=today
-            ).count()
+            ).aggregate(
+                total=Count('id'),
+                pending=Count('id', filter=Q(status='pending'))
+            )
+            total_bookings = booking_counts['total']
+            pending_bookings = booking_counts['pending']
             
-            from .models import User
             available_vendors = User.objects.filter(
                 role='vendor',
                 pincode=pincode,
                 is_available=True,
                 is_active=True
             ).count()
-            
-            demand_ratio = total_bookings / available_vendors if available_vendors > 0 else float('inf')
         
-        # Determine demand level
-        if demand_ratio < 1:
-            level = 'very_low'
-        elif demand_ratio < 2:
-            level = 'low'
-        elif demand_ratio < 3:
-            level = 'normal'
-        elif demand_ratio < 5:
-            level = 'high'
-        elif demand_ratio < 8:
-            level = 'very_high'
+        if available_vendors > 0:
+            demand_ratio = total_bookings / available_vendors
         else:
-            level = 'extreme'
+            demand_ratio = cls.NO_VENDOR_DEMAND_RATIO
+        
+        # Determine demand level
+        level = cls.DEMAND_LEVELS[bisect_right(cls.DEMAND_RATIO_THRESHOLDS, demand_ratio)]
         
         data = {
             'level': level,
-            'demand_ratio': round(demand_ratio, 2) if demand_ratio != float('inf') else 999,
+            'demand_ratio': round(demand_ratio, 2),
             'total_bookings': total_bookings,
             'pending_bookings': pending_bookings
         }
         
         # Cache for 10 minutes
-        cache.set(cache_key, data, 600)
+        cls._cache_pricing_data(cache_key, data, 600)
         return data
     
     @classmethod
-    def _get_supply_data(cls, pincode):
+    def _get_supply_data(cls, pincode, prefetched=None):
         """Get real-time supply/vendor availability data"""
-        from .models import User, Booking
-        
         # Try cache first
         cache_key = f"supply_data_{pincode}"
-        cached_data = cache.get(cache_key)
+        cached_data = (prefetched if prefetched is not None else cls._cache_get_many([cache_key])).get(cache_key)
         if cached_data:
             return cached_data
         
@@ -284,24 +376,13 @@ class DynamicPricingService:
             scheduled_date__date=today,
             status__in=['confirmed', 'in_progress'],
             vendor__isnull=False
-        ).values('vendor').distinct().count()
+        ).aggregate(busy=Count('vendor', distinct=True))['busy']
         
         # Effective available vendors
         effective_vendors = max(0, available_vendors - busy_vendors)
         
         # Determine supply level
-        if effective_vendors == 0:
-            level = 'no_vendors'
-        elif effective_vendors == 1:
-            level = 'very_low'
-        elif effective_vendors <= 3:
-            level = 'low'
-        elif effective_vendors <= 6:
-            level = 'normal'
-        elif effective_vendors <= 10:
-            level = 'good'
-        else:
-            level = 'excellent'
+        level = cls.SUPPLY_LEVELS[bisect_right(cls.SUPPLY_VENDOR_THRESHOLDS, effective_vendors)]
         
         data = {
             'level': level,
@@ -311,15 +392,39 @@ class DynamicPricingService:
         }
         
         # Cache for 5 minutes
-        cache.set(cache_key, data, 300)
+        cls._cache_pricing_data(cache_key, data, 300)
         return data
     
     @classmethod
     def _get_time_factors(cls, scheduled_datetime):
         """Analyze time-based pricing factors"""
-        hour = scheduled_datetime.hour
+        return cls._get_time_slot(scheduled_datetime)[0]
+    
+    @classmethod
+    def _get_time_slot(cls, scheduled_datetime):
+        """Time factors and time multiplier for a scheduled datetime"""
         is_weekend = scheduled_datetime.weekday() >= 5
-        
+        return cls._time_slot_table()[is_weekend * 24 + scheduled_datetime.hour]
+    
+    @classmethod
+    def _time_slot_table(cls):
+        """
+        (factors, multiplier) for each hour of a weekday followed by each hour
+        of a weekend day. The time rules depend on nothing else, so all 48
+        slots are resolved once, on first use.
+        """
+        if cls._TIME_SLOT_TABLE is None:
+            table = []
+            for is_weekend in (False, True):
+                for hour in range(24):
+                    factors = cls._compute_time_factors(hour, is_weekend)
+                    table.append((factors, cls._calculate_time_multiplier(factors)))
+            cls._TIME_SLOT_TABLE = tuple(table)
+        return cls._TIME_SLOT_TABLE
+    
+    @staticmethod
+    def _compute_time_factors(hour, is_weekend):
+        """Apply the time-based pricing rules to an hour of the day"""
         factors = []
         
         # Check peak hours (5 PM - 9 PM)
@@ -338,36 +443,37 @@ class DynamicPricingService:
         if is_weekend:
             factors.append('weekend')
         
-        return factors
+        return tuple(factors)
     
     @classmethod
-    def _get_performance_data(cls, pincode):
+    def _get_performance_data(cls, pincode, prefetched=None):
         """Get historical performance data for area"""
-        from .models import PincodeAnalytics, Signature
-        
         # Try cache
         cache_key = f"performance_data_{pincode}"
-        cached_data = cache.get(cache_key)
+        cached_data = (prefetched if prefetched is not None else cls._cache_get_many([cache_key])).get(cache_key)
         if cached_data:
             return cached_data
         
         # Get last 7 days analytics
         week_ago = timezone.now().date() - timedelta(days=7)
-        analytics = PincodeAnalytics.objects.filter(
+        totals = PincodeAnalytics.objects.filter(
             pincode=pincode,
             date__gte=week_ago
+        ).aggregate(
+            days=Count('id'),
+            total_bookings=Sum('total_bookings'),
+            completed_bookings=Sum('completed_bookings'),
+            avg_rating=Avg('customer_satisfaction_avg')
         )
+        has_data = totals['days'] > 0
         
-        if analytics.exists():
+        if has_data:
             # Calculate completion rate
-            total_bookings = sum(a.total_bookings for a in analytics)
-            completed_bookings = sum(a.completed_bookings for a in analytics)
-            completion_rate = (completed_bookings / total_bookings * 100) if total_bookings > 0 else 0
+            total_bookings = totals['total_bookings']
+            completion_rate = (totals['completed_bookings'] / total_bookings * 100) if total_bookings > 0 else 0
             
             # Get average satisfaction
-            avg_satisfaction = analytics.aggregate(
-                avg_rating=Avg('customer_satisfaction_avg')
-            )['avg_rating'] or 0
+            avg_satisfaction = totals['avg_rating'] or 0
         else:
             completion_rate = 100  # Default to neutral
             avg_satisfaction = 3.5  # Default to neutral
@@ -375,11 +481,11 @@ class DynamicPricingService:
         data = {
             'completion_rate': round(completion_rate, 2),
             'avg_satisfaction': round(avg_satisfaction, 2) if avg_satisfaction else 0,
-            'has_data': analytics.exists()
+            'has_data': has_data
         }
         
         # Cache for 1 hour
-        cache.set(cache_key, data, 3600)
+        cls._cache_pricing_data(cache_key, data, 3600)
         return data
     
     @classmethod
@@ -441,45 +547,56 @@ class DynamicPricingService:
         """
         predictions = []
         base_date = timezone.now()
+        base_price = float(service.base_price)
+        
+        # Demand, supply and performance are scoped to the pincode, not to the
+        # slot, so fetch them once for the whole horizon; only the time
+        # multiplier varies per slot.
+        prefetched = cls._get_all_cached(pincode)
+        demand_data = cls._get_demand_data(pincode, prefetched)
+        supply_data = cls._get_supply_data(pincode, prefetched)
+        performance_data = cls._get_performance_data(pincode, prefetched)
+        fixed_multiplier = (
+            cls._calculate_demand_multiplier(demand_data)
+            * cls._calculate_supply_multiplier(supply_data)
+            * cls._calculate_performance_multiplier(performance_data)
+        )
+        
+        # Weekday/weekend is the only calendar input to the time multiplier,
+        # so every day in the horizon reuses one of two precomputed rows.
+        day_rows = {}
         
         for day_offset in range(date_range_days):
             prediction_date = base_date + timedelta(days=day_offset)
+            is_weekend = prediction_date.weekday() >= 5
             
-            # Get price for different times of day
-            morning_price = cls.calculate_dynamic_price(
-                service, pincode, 
-                prediction_date.replace(hour=9, minute=0)
-            )
-            
-            afternoon_price = cls.calculate_dynamic_price(
-                service, pincode,
-                prediction_date.replace(hour=14, minute=0)
-            )
-            
-            evening_price = cls.calculate_dynamic_price(
-                service, pincode,
-                prediction_date.replace(hour=18, minute=0)
-            )
+            row = day_rows.get(is_weekend)
+            if row is None:
+                # Get price for different times of day
+                prices = {
+                    slot: cls._round_price(
+                        base_price * fixed_multiplier
+                        * cls._get_time_slot(prediction_date.replace(hour=hour, minute=0))[1]
+                    )
+                    for slot, hour in cls.PREDICTION_SLOTS
+                }
+                morning_factors = cls._get_time_factors(
+                    prediction_date.replace(hour=cls.PREDICTION_SLOTS[0][1], minute=0)
+                )
+                row = day_rows[is_weekend] = {
+                    'prices': prices,
+                    'avg_price': round(sum(prices.values()) / len(prices), 2),
+                    'best_time': min(prices.items(), key=lambda x: x[1])[0],
+                    'surge_info': cls._get_surge_info(demand_data, supply_data, morning_factors),
+                }
             
             predictions.append({
                 'date': prediction_date.date().isoformat(),
                 'day_of_week': prediction_date.strftime('%A'),
-                'prices': {
-                    'morning': morning_price['final_price'],
-                    'afternoon': afternoon_price['final_price'],
-                    'evening': evening_price['final_price']
-                },
-                'avg_price': round((
-                    morning_price['final_price'] + 
-                    afternoon_price['final_price'] + 
-                    evening_price['final_price']
-                ) / 3, 2),
-                'best_time': min([
-                    ('morning', morning_price['final_price']),
-                    ('afternoon', afternoon_price['final_price']),
-                    ('evening', evening_price['final_price'])
-                ], key=lambda x: x[1])[0],
-                'surge_info': morning_price.get('surge_info', {})
+                'prices': dict(row['prices']),
+                'avg_price': row['avg_price'],
+                'best_time': row['best_time'],
+                'surge_info': row['surge_info'],
             })
         
         return predictions
@@ -539,15 +656,49 @@ class DynamicPricingService:
                 'recommendations': []
             }
     
+    @staticmethod
+    def _cache_pricing_data(cache_key, data, timeout):
+        """Cache pricing data under the current pricing cache version"""
+        cache.set(cache_key, data, timeout, version=_get_pricing_cache_version())
+        _local_cache_set(cache_key, data)
+    
+    @staticmethod
+    def _pricing_cache_keys(pincode):
+        """Cache keys holding pricing data for a pincode"""
+        return [
+            f"demand_data_{pincode}",
+            f"supply_data_{pincode}",
+            f"performance_data_{pincode}",
+        ]
+    
+    @classmethod
+    def warm_cache(cls, pincode):
+        """Compute and cache any pricing data missing for a pincode"""
+        # Check the shared cache directly: this process's local copies say
+        # nothing about what other workers will find
+        prefetched = cache.get_many(cls._pricing_cache_keys(pincode), version=_get_pricing_cache_version())
+        cls._get_demand_data(pincode, prefetched)
+        cls._get_supply_data(pincode, prefetched)
+        cls._get_performance_data(pincode, prefetched)
+    
     @classmethod
     def clear_cache(cls, pincode=None):
         """Clear pricing cache for a pincode or all"""
+        # Only this process's local copies can be dropped here; other workers
+        # pick up the change once their short local TTL runs out.
         if pincode:
-            cache.delete(f"demand_data_{pincode}")
-            cache.delete(f"supply_data_{pincode}")
-            cache.delete(f"performance_data_{pincode}")
+            keys = cls._pricing_cache_keys(pincode)
+            cache.delete_many(keys, version=_get_pricing_cache_version())
+            for key in keys:
+                _LOCAL_CACHE.pop(key, None)
         else:
-            # Clear all pricing-related cache
-            cache.delete_pattern("demand_data_*")
-            cache.delete_pattern("supply_data_*")
-            cache.delete_pattern("performance_data_*")
\ No newline at end of file
+            # Move every pincode to a new key generation at once, without scanning
+            # the keyspace; the old entries simply expire
+            try:
+                version = cache.incr(PRICING_CACHE_VERSION_KEY)
+            except ValueError:
+                # Version key was lost; start past any generation this process has used
+                cache.add(PRICING_CACHE_VERSION_KEY, max(int(time.time()), (_pricing_cache_version[1] or 0) + 1), None)
+                version = cache.get(PRICING_CACHE_VERSION_KEY)
+            _set_pricing_cache_version(version)
+            _LOCAL_CACHE.clear()
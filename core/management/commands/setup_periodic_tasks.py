@@ -4,6 +4,8 @@ Django management command to set up Celery periodic tasks for automated messagin
 
 from django.core.management.base import BaseCommand
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,8 +23,7 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         try:
-            from django_celery_beat.models import PeriodicTask, CrontabSchedule
-            from django.utils import timezone
+            from django_celery_beat.models import PeriodicTask, PeriodicTasks, CrontabSchedule
             
             self.stdout.write(self.style.SUCCESS('Setting up periodic tasks...'))
             
@@ -82,49 +83,66 @@ class Command(BaseCommand):
                     'schedule': {'hour': 2, 'minute': 0, 'day_of_week': '0'},  # Weekly on Sunday at 2:00 AM
                     'description': 'Clean up old notification logs and business alerts'
                 },
+                {
+                    'name': 'Warm Pricing Cache',
+                    'task': 'core.tasks.warm_pricing_cache',
+                    'schedule': {'hour': '*', 'minute': '*/5'},  # Every 5 minutes
+                    'description': 'Pre-compute dynamic pricing data for active pincodes',
+                    # Drop a run still queued when the next one is due, so a backlog
+                    # cannot stack overlapping warm-ups
+                    'expire_seconds': 240,
+                },
             ]
             
-            created_count = 0
-            updated_count = 0
-            
-            for task_config in periodic_tasks:
-                try:
-                    # Create or get the cron schedule
-                    schedule, schedule_created = CrontabSchedule.objects.get_or_create(
-                        **task_config['schedule']
+            if options['dry_run']:
+                for task_config in periodic_tasks:
+                    self.stdout.write(f"Would create/update task: {task_config['name']}")
+            else:
+                with transaction.atomic():
+                    schedules = self._get_or_create_schedules(
+                        CrontabSchedule, [task_config['schedule'] for task_config in periodic_tasks]
+                    )
+                    existing_names = set(
+                        PeriodicTask.objects.filter(
+                            name__in=[task_config['name'] for task_config in periodic_tasks]
+                        ).values_list('name', flat=True)
                     )
                     
-                    if options['dry_run']:
-                        self.stdout.write(f"Would create/update task: {task_config['name']}")
-                        continue
-                    
-                    # Create or update the periodic task
-                    periodic_task, task_created = PeriodicTask.objects.update_or_create(
-                        name=task_config['name'],
-                        defaults={
-                            'task': task_config['task'],
-                            'crontab': schedule,
-                            'enabled': True,
-                            'description': task_config['description'],
-                        }
+                    # Create or update all periodic tasks in one upsert
+                    PeriodicTask.objects.bulk_create(
+                        [
+                            PeriodicTask(
+                                name=task_config['name'],
+                                task=task_config['task'],
+                                crontab=schedules[self._schedule_key(task_config['schedule'])],
+                                enabled=True,
+                                description=task_config['description'],
+                                expire_seconds=task_config.get('expire_seconds'),
+                            )
+                            for task_config in periodic_tasks
+                        ],
+                        update_conflicts=True,
+                        unique_fields=['name'],
+                        update_fields=['task', 'crontab', 'enabled', 'description', 'expire_seconds'],
                     )
                     
-                    if task_created:
-                        created_count += 1
+                    # bulk_create bypasses PeriodicTask.save(), so tell Celery Beat
+                    # to reload its schedule explicitly
+                    PeriodicTasks.update_changed()
+                
+                created_count = 0
+                updated_count = 0
+                for task_config in periodic_tasks:
+                    if task_config['name'] in existing_names:
+                        updated_count += 1
                         self.stdout.write(
-                            self.style.SUCCESS(f"✓ Created task: {task_config['name']}")
+                            self.style.WARNING(f"↻ Updated task: {task_config['name']}")
                         )
                     else:
-                        updated_count += 1
+                        created_count += 1
                         self.stdout.write(
-                            self.style.WARNING(f"↻ Updated task: {task_config['name']}")
+                            self.style.SUCCESS(f"✓ Created task: {task_config['name']}")
                         )
-                    
-                except Exception as task_error:
-                    self.stdout.write(
-                        self.style.ERROR(f"✗ Error setting up task {task_config['name']}: {str(task_error)}")
-                    )
-                    continue
             
             if options['dry_run']:
                 self.stdout.write(
@@ -141,7 +159,7 @@ class Command(BaseCommand):
                 # Provide next steps
                 self.stdout.write("\n" + "="*50)
                 self.stdout.write(self.style.SUCCESS("Next Steps:"))
-                self.stdout.write("1. Start Celery worker: celery -A homeserve_pro worker --loglevel=info")
+                self.stdout.write("1. Start Celery worker: celery -A homeserve_pro worker -Q celery,notifications --loglevel=info")
                 self.stdout.write("2. Start Celery beat: celery -A homeserve_pro beat --loglevel=info")
                 self.stdout.write("3. Monitor tasks in Django Admin > Periodic Tasks")
                 
@@ -156,4 +174,33 @@ class Command(BaseCommand):
             self.stdout.write(
                 self.style.ERROR(f"Error setting up periodic tasks: {str(e)}")
             )
-            logger.error(f"Error in setup_periodic_tasks command: {str(e)}")
\ No newline at end of file
+            logger.error(f"Error in setup_periodic_tasks command: {str(e)}")
+
+    @staticmethod
+    def _schedule_key(schedule):
+        """Hashable key for a schedule config; crontab fields are stored as strings"""
+        return tuple(sorted((field, str(value)) for field, value in schedule.items()))
+
+    def _get_or_create_schedules(self, CrontabSchedule, schedule_configs):
+        """
+        Map each distinct schedule config to a CrontabSchedule, looking up the
+        existing ones in a single query and bulk-creating the rest
+        """
+        configs = {self._schedule_key(schedule): schedule for schedule in schedule_configs}
+        
+        lookup = Q()
+        for schedule in configs.values():
+            lookup |= Q(**schedule)
+        
+        schedules = {}
+        for crontab in CrontabSchedule.objects.filter(lookup).order_by('pk'):
+            for key in configs:
+                if key not in schedules and all(str(getattr(crontab, field)) == value for field, value in key):
+                    schedules[key] = crontab
+        
+        missing = [key for key in configs if key not in schedules]
+        created = CrontabSchedule.objects.bulk_create(
+            [CrontabSchedule(**configs[key]) for key in missing]
+        )
+        schedules.update(zip(missing, created))
+        return schedules
\ No newline at end of file
@@ -0,0 +1,17 @@
+# Generated by Django 5.1 on 2026-10-16 18:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_add_docusign_fields'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dispute',
+            index=models.Index(fields=['assigned_mediator', 'status'], name='core_disput_assigne_c147cd_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1 on 2026-10-16 18:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_dispute_mediator_status_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='disputemessage',
+            index=models.Index(fields=['dispute', 'recipient', 'is_read'], name='core_disput_dispute_83b13d_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-16 18:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_disputemessage_unread_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='disputemessage',
+            name='message_type',
+            field=models.CharField(choices=[('text', 'Text Message'), ('image', 'Image'), ('document', 'Document'), ('system', 'System Message'), ('vendor_response', 'Vendor Response')], default='text', max_length=15),
+        ),
+    ]
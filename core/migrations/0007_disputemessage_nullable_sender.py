@@ -0,0 +1,20 @@
+# Generated by Django 5.1 on 2026-10-16 18:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_dispute_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='disputemessage',
+            name='sender',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='sent_messages', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1 on 2026-10-16 19:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_disputemessage_nullable_sender'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['vendor', 'status', 'scheduled_date'], name='core_bookin_vendor__4f4fe4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['customer', 'status'], name='core_bookin_custome_71d916_idx'),
+        ),
+    ]
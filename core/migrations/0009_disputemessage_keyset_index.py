@@ -0,0 +1,21 @@
+# Generated by Django 5.1 on 2026-10-16 19:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_booking_party_status_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='disputemessage',
+            name='core_disput_dispute_44bbd0_idx',
+        ),
+        migrations.AddIndex(
+            model_name='disputemessage',
+            index=models.Index(fields=['dispute', 'created_at', 'id'], name='core_disput_dispute_53679b_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-16 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_disputemessage_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='signature',
+            name='docusign_envelope_id',
+            field=models.CharField(blank=True, db_index=True, max_length=100, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-16 19:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0010_signature_envelope_id_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role', 'pincode', 'is_available'], name='core_user_role_39f6c3_idx'),
+        ),
+    ]
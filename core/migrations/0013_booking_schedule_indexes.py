@@ -0,0 +1,21 @@
+# Generated by Django 5.1 on 2026-10-16 19:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_phone_validator_end_anchor'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['customer', '-created_at'], name='booking_customer_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['pincode', 'status', 'scheduled_date'], name='core_bookin_pincode_007ad6_idx'),
+        ),
+    ]
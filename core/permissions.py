@@ -1,6 +1,10 @@
 from rest_framework.permissions import BasePermission
 
 
+# Roles that may act on any dispute without being a party to it
+DISPUTE_ADMIN_ROLES = frozenset({'ops_manager', 'super_admin'})
+
+
 class IsCustomer(BasePermission):
     """Permission class for customers only"""
     
@@ -67,13 +71,13 @@ class IsOwnerOrAdmin(BasePermission):
         if request.user.role in ['onboard_manager', 'ops_manager', 'super_admin']:
             return True
         
-        # Object-specific ownership checks
-        if hasattr(obj, 'customer'):
-            return obj.customer == request.user
-        elif hasattr(obj, 'vendor'):
-            return obj.vendor == request.user
-        elif hasattr(obj, 'user'):
-            return obj.user == request.user
+        # Object-specific ownership checks, on foreign key ids so no User is loaded
+        if hasattr(obj, 'customer_id'):
+            return obj.customer_id == request.user.id
+        elif hasattr(obj, 'vendor_id'):
+            return obj.vendor_id == request.user.id
+        elif hasattr(obj, 'user_id'):
+            return obj.user_id == request.user.id
         
         return False
 
@@ -86,15 +90,12 @@ class IsDisputeParty(BasePermission):
     
     def has_object_permission(self, request, view, obj):
         # Admin users can access all disputes
-        if request.user.role in ['ops_manager', 'super_admin']:
-            return True
-        
-        # Check if user is a party to this dispute
-        if hasattr(obj, 'customer') and obj.customer == request.user:
-            return True
-        if hasattr(obj, 'vendor') and obj.vendor == request.user:
-            return True
-        if hasattr(obj, 'assigned_mediator') and obj.assigned_mediator == request.user:
+        if request.user.role in DISPUTE_ADMIN_ROLES:
             return True
         
-        return False
\ No newline at end of file
+        # Check if user is a party to this dispute by id, without loading the related users
+        return request.user.id in (
+            getattr(obj, 'customer_id', None),
+            getattr(obj, 'vendor_id', None),
+            getattr(obj, 'assigned_mediator_id', None),
+        )
\ No newline at end of file
@@ -632,6 +632,140 @@ def cleanup_old_notifications():
         raise
 
 
+@shared_task
+def send_dispute_notifications_task(dispute_id, event_type):
+    """Send dispute event emails to all participants outside the request cycle"""
+    from .models import Dispute
+    from .dispute_service import DisputeResolutionService
+    
+    try:
+        dispute = Dispute.objects.select_related(
+            'customer', 'vendor', 'assigned_mediator', 'booking'
+        ).get(id=dispute_id)
+        
+        DisputeResolutionService._send_dispute_notifications(dispute, event_type)
+        return f"Sent {event_type} notifications for dispute {dispute_id}"
+        
+    except Dispute.DoesNotExist:
+        logger.warning(f"Dispute {dispute_id} no longer exists, skipping {event_type} notifications")
+    except Exception as e:
+        logger.error(f"Error in send_dispute_notifications_task: {str(e)}")
+        raise
+
+
+@shared_task
+def send_dispute_notifications_batch_task(dispute_ids, event_type):
+    """Send dispute event emails for a batch of disputes in one task"""
+    from django.core.mail import get_connection
+    from .models import Dispute
+    from .dispute_service import DisputeResolutionService
+    
+    try:
+        disputes = Dispute.objects.filter(id__in=dispute_ids).select_related(
+            'customer', 'vendor', 'assigned_mediator', 'booking'
+        )
+        
+        # One SMTP session for the whole batch rather than one per dispute
+        sent_count = 0
+        with get_connection(fail_silently=True) as connection:
+            for dispute in disputes:
+                DisputeResolutionService._send_dispute_notifications(dispute, event_type, connection=connection)
+                sent_count += 1
+        
+        return f"Sent {event_type} notifications for {sent_count} disputes"
+        
+    except Exception as e:
+        logger.error(f"Error in send_dispute_notifications_batch_task: {str(e)}")
+        raise
+
+
+@shared_task
+def notify_message_sent_task(message_id):
+    """Send the real-time notification for a new dispute message"""
+    from .models import DisputeMessage
+    from .dispute_service import DisputeResolutionService
+    
+    try:
+        message = DisputeMessage.objects.select_related(
+            'dispute', 'sender', 'recipient'
+        ).get(id=message_id)
+        
+        DisputeResolutionService._notify_message_sent(message)
+        return f"Notified recipient of dispute message {message_id}"
+        
+    except DisputeMessage.DoesNotExist:
+        logger.warning(f"Dispute message {message_id} no longer exists, skipping notification")
+    except Exception as e:
+        logger.error(f"Error in notify_message_sent_task: {str(e)}")
+        raise
+
+
+@shared_task
+def process_automatic_payment_task(booking_id):
+    """Release payment for a booking whose signature was completed via DocuSign"""
+    from .models import Booking
+    from .payment_service import PaymentService
+    
+    try:
+        booking = Booking.objects.select_related('signature', 'payment').get(id=booking_id)
+        
+        if PaymentService.process_automatic_payment(booking):
+            return f"Processed automatic payment for booking {booking_id}"
+        return f"Automatic payment not processed for booking {booking_id}"
+        
+    except Booking.DoesNotExist:
+        logger.warning(f"Booking {booking_id} no longer exists, skipping automatic payment")
+    except Exception as e:
+        logger.error(f"Error in process_automatic_payment_task: {str(e)}")
+        raise
+
+
+@shared_task
+def warm_pricing_cache(time_budget_seconds=60):
+    """
+    Queue a pricing warm-up for every pincode with active vendors, staggered
+    over the time budget so expired entries are not all rebuilt at once
+    """
+    from .models import User
+    
+    try:
+        pincodes = list(
+            User.objects.filter(role='vendor', is_active=True)
+            .exclude(pincode='')
+            .values_list('pincode', flat=True)
+            .distinct()
+        )
+        step = time_budget_seconds / len(pincodes) if pincodes else 0
+        
+        # Stagger with countdowns instead of sleeping here, so no worker is held
+        # for the budget; a warm-up still queued a budget after its slot is dropped
+        for index, pincode in enumerate(pincodes):
+            countdown = index * step
+            warm_pricing_cache_for_pincode.apply_async(
+                (pincode,), countdown=countdown, expires=countdown + time_budget_seconds
+            )
+        
+        return f"Queued pricing cache warm-up for {len(pincodes)} pincodes"
+        
+    except Exception as e:
+        logger.error(f"Error in warm_pricing_cache: {str(e)}")
+        raise
+
+
+@shared_task
+def warm_pricing_cache_for_pincode(pincode):
+    """Pre-compute any pricing data missing for one pincode"""
+    from .dynamic_pricing_service import DynamicPricingService
+    
+    try:
+        DynamicPricingService.warm_cache(pincode)
+        return f"Warmed pricing cache for pincode {pincode}"
+        
+    except Exception as e:
+        logger.error(f"Error warming pricing cache for pincode {pincode}: {str(e)}")
+        raise
+
+
 # Additional task for manual testing
 @shared_task
 def test_notification_system():
@@ -1,3 +1,281 @@
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
 from django.test import TestCase
+from django.utils import timezone
+
+from .dispute_service import DisputeResolutionService
+from .models import Booking, Dispute, DisputeMessage, Service, Signature, User
+
+
+def create_user(username, role='customer'):
+    return User.objects.create_user(username=username, password='password', role=role)
+
+
+def create_booking(customer, vendor=None, **kwargs):
+    service = Service.objects.get_or_create(
+        name='Plumbing',
+        defaults={'description': 'Pipe repair', 'base_price': Decimal('500.00'), 'category': 'plumbing'}
+    )[0]
+    return Booking.objects.create(
+        customer=customer,
+        vendor=vendor,
+        service=service,
+        total_price=Decimal('500.00'),
+        pincode='560001',
+        scheduled_date=timezone.now() + timedelta(days=1),
+        **kwargs
+    )
+
+
+def create_dispute(customer, vendor, **kwargs):
+    return Dispute.objects.create(
+        booking=create_booking(customer, vendor),
+        customer=customer,
+        vendor=vendor,
+        dispute_type='service_quality',
+        title='Leak not fixed',
+        description='The pipe still leaks',
+        **kwargs
+    )
+
+
+class SignatureTests(TestCase):
+    def setUp(self):
+        self.customer = create_user('customer')
+        self.booking = create_booking(self.customer)
+
+    def test_signed_signature_is_persisted_and_verifies(self):
+        signature = Signature(
+            booking=self.booking,
+            signed_by=self.customer,
+            status='signed',
+            signed_at=timezone.now(),
+            satisfaction_rating=5,
+            signature_data={'envelope_id': 'env-1', 'ip_address': '127.0.0.1'}
+        )
+        signature.save()
+
+        stored = Signature.objects.get(pk=signature.pk)
+        self.assertEqual(stored.status, 'signed')
+        self.assertEqual(len(stored.signature_hash), 64)
+        self.assertTrue(stored.verify_signature_integrity())
+
+    def test_tampered_signature_fails_verification(self):
+        signature = Signature.objects.create(
+            booking=self.booking,
+            signed_by=self.customer,
+            status='signed',
+            signed_at=timezone.now(),
+            satisfaction_rating=5,
+            signature_data={'envelope_id': 'env-1'}
+        )
+
+        Signature.objects.filter(pk=signature.pk).update(satisfaction_rating=1)
+        signature.refresh_from_db()
+        self.assertFalse(signature.verify_signature_integrity())
+
+
+class BookingStatusNotificationTests(TestCase):
+    def setUp(self):
+        self.customer = create_user('customer')
+        patcher = mock.patch('core.status_service.BookingStatusService.send_status_update')
+        self.send_status_update = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_create_notifies_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            booking = create_booking(self.customer)
+
+        self.send_status_update.assert_called_once_with(booking, None)
+
+    def test_each_status_change_notifies_once(self):
+        booking = create_booking(self.customer)
+        self.send_status_update.reset_mock()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.status = 'confirmed'
+            booking.save()
+            booking.save()  # No change, no notification
+            booking.status = 'in_progress'
+            booking.save()
+
+        self.assertEqual(
+            self.send_status_update.call_args_list,
+            [mock.call(booking, 'pending'), mock.call(booking, 'confirmed')]
+        )
+
+    def test_save_of_loaded_booking_without_change_does_not_notify(self):
+        booking_id = create_booking(self.customer).pk
+        self.send_status_update.reset_mock()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            booking = Booking.objects.get(pk=booking_id)
+            booking.customer_notes = 'Ring the bell'
+            booking.save()
+
+        self.send_status_update.assert_not_called()
+
+    def test_notification_waits_for_commit(self):
+        booking = create_booking(self.customer)
+        self.send_status_update.reset_mock()
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            booking.status = 'confirmed'
+            booking.save()
+        self.send_status_update.assert_not_called()
+        self.assertEqual(len(callbacks), 1)
+
+
+class DisputeAccessTests(TestCase):
+    def setUp(self):
+        self.customer = create_user('customer')
+        self.vendor = create_user('vendor', role='vendor')
+        self.outsider = create_user('outsider')
+        self.ops_manager = create_user('ops', role='ops_manager')
+        self.dispute = create_dispute(self.customer, self.vendor)
+
+    def test_parties_and_privileged_roles_can_read_messages(self):
+        for user in (self.customer, self.vendor, self.ops_manager):
+            with self.assertNumQueries(3):  # access check, page, total count
+                result = DisputeResolutionService.get_dispute_messages(self.dispute.id, user)
+            self.assertTrue(result['success'], user.username)
+
+    def test_outsider_is_unauthorized(self):
+        result = DisputeResolutionService.get_dispute_messages(self.dispute.id, self.outsider)
+        self.assertEqual(result['error'], 'Unauthorized to view this dispute')
+
+    def test_missing_dispute_is_not_found_for_every_role(self):
+        missing_id = Dispute().id
+        for user in (self.outsider, self.ops_manager):
+            result = DisputeResolutionService.get_dispute_messages(missing_id, user)
+            self.assertEqual(result['error'], 'Dispute not found')
+            result = DisputeResolutionService.mark_messages_read(missing_id, user)
+            self.assertEqual(result['error'], 'Dispute not found')
+
+
+class DisputeMessagePaginationTests(TestCase):
+    def setUp(self):
+        self.customer = create_user('customer')
+        self.vendor = create_user('vendor', role='vendor')
+        self.dispute = create_dispute(self.customer, self.vendor)
+
+        # Messages sharing a timestamp, so page boundaries fall between ties
+        created_at = timezone.now() - timedelta(hours=1)
+        DisputeMessage.objects.bulk_create([
+            DisputeMessage(dispute=self.dispute, sender=self.customer, content=f"Message {i}")
+            for i in range(7)
+        ])
+        DisputeMessage.objects.filter(dispute=self.dispute).update(created_at=created_at)
+        DisputeMessage.objects.create(dispute=self.dispute, sender=self.vendor, content='Latest')
+
+        self.expected_ids = list(
+            DisputeMessage.objects.filter(dispute=self.dispute)
+            .order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+
+    def _collect_pages(self, page_size):
+        seen = []
+        result = DisputeResolutionService.get_dispute_messages(self.dispute.id, self.customer, page_size=page_size)
+        # A cursor that fails to move past ties would page forever
+        for _ in self.expected_ids:
+            self.assertTrue(result['success'])
+            seen.extend(message.id for message in result['messages'])
+            if not result['has_more']:
+                return seen
+            result = DisputeResolutionService.get_dispute_messages(
+                self.dispute.id, self.customer, page_size=page_size,
+                before_id=result['next_cursor'], include_total=False
+            )
+        self.fail(f"Pagination did not finish within {len(self.expected_ids)} pages")
+
+    def test_keyset_pages_cover_tied_timestamps_once_in_order(self):
+        for page_size in (1, 2, 3, 8):
+            self.assertEqual(self._collect_pages(page_size), self.expected_ids, page_size)
+
+    def test_offset_page_matches_keyset_page(self):
+        first = DisputeResolutionService.get_dispute_messages(self.dispute.id, self.customer, page_size=3)
+        keyset = DisputeResolutionService.get_dispute_messages(
+            self.dispute.id, self.customer, page_size=3, before_id=first['next_cursor']
+        )
+        offset = DisputeResolutionService.get_dispute_messages(self.dispute.id, self.customer, page=2, page_size=3)
+
+        self.assertEqual([m.id for m in keyset['messages']], [m.id for m in offset['messages']])
+        self.assertEqual(offset['total_count'], len(self.expected_ids))
+
+
+class BulkCreateDisputesTests(TestCase):
+    def setUp(self):
+        self.customer = create_user('customer')
+        self.vendor = create_user('vendor', role='vendor')
+        self.busy_manager = create_user('ops1', role='ops_manager')
+        self.idle_manager = create_user('ops2', role='ops_manager')
+        create_dispute(self.customer, self.vendor, assigned_mediator=self.busy_manager, status='investigating')
+
+    def _rows(self, count, dispute_type='vendor_behavior'):
+        return [
+            {
+                'booking': create_booking(self.customer, self.vendor),
+                'customer': self.customer,
+                'dispute_type': dispute_type,
+                'title': f"Dispute {i}",
+                'description': 'Imported'
+            }
+            for i in range(count)
+        ]
+
+    @mock.patch('core.dispute_service.send_dispute_notifications_batch_task')
+    def test_batch_is_spread_across_mediators_by_workload(self, _notifications):
+        disputes = DisputeResolutionService.bulk_create_disputes(self._rows(5))
+
+        self.assertEqual(len(disputes), 5)
+        assigned = Counter(dispute.assigned_mediator for dispute in disputes)
+        # The idle manager catches up first, then the batch alternates
+        self.assertEqual(assigned, {self.idle_manager: 3, self.busy_manager: 2})
+        self.assertEqual(disputes[0].assigned_mediator, self.idle_manager)
+
+        active = Counter(
+            Dispute.objects.filter(status='investigating').values_list('assigned_mediator', flat=True)
+        )
+        self.assertEqual(active, {self.busy_manager.id: 3, self.idle_manager.id: 3})
+
+    @mock.patch('core.dispute_service.send_dispute_notifications_batch_task')
+    def test_high_severity_prefers_super_admin(self, _notifications):
+        super_admin = create_user('admin', role='super_admin')
+
+        disputes = DisputeResolutionService.bulk_create_disputes(self._rows(2, dispute_type='payment_issue'))
+
+        self.assertEqual([dispute.assigned_mediator for dispute in disputes], [super_admin, super_admin])
+
+    @mock.patch('core.dispute_service.send_dispute_notifications_batch_task')
+    def test_booking_with_open_dispute_is_skipped(self, _notifications):
+        rows = self._rows(1)
+        rows.append(dict(rows[0], title='Duplicate'))
+
+        disputes = DisputeResolutionService.bulk_create_disputes(rows)
+
+        self.assertEqual([dispute.title for dispute in disputes], ['Dispute 0'])
+
+
+class WarmPricingCacheTests(TestCase):
+    @mock.patch('core.tasks.warm_pricing_cache_for_pincode.apply_async')
+    def test_pincodes_are_queued_with_staggered_countdowns(self, apply_async):
+        from .tasks import warm_pricing_cache
+
+        for index, pincode in enumerate(('560001', '560002', '560001', '560003')):
+            vendor = create_user(f"vendor{index}", role='vendor')
+            vendor.pincode = pincode
+            vendor.save()
+
+        warm_pricing_cache(time_budget_seconds=60)
 
-# Create your tests here.
+        queued = sorted(
+            (call.args[0], call.kwargs['countdown'], call.kwargs['expires'])
+            for call in apply_async.call_args_list
+        )
+        self.assertEqual([pincode for (pincode,), _, _ in queued], ['560001', '560002', '560003'])
+        self.assertEqual(sorted(countdown for _, countdown, _ in queued), [0, 20, 40])
+        for _, countdown, expires in queued:
+            self.assertEqual(expires, countdown + 60)
@@ -67,19 +67,14 @@ class GoogleMapsService:
     def _get_from_cache(self, from_pincode: str, to_pincode: str) -> Optional[TravelTimeCache]:
         """Get travel time from cache if available and not expired"""
         try:
-            cached = TravelTimeCache.objects.get(
+            # Entries older than 24 hours are ignored here and flagged in bulk
+            # by TravelTimeCache.expire_stale()
+            return TravelTimeCache.objects.get(
                 from_pincode=from_pincode,
                 to_pincode=to_pincode,
-                is_expired=False
+                is_expired=False,
+                calculated_at__gte=timezone.now() - TravelTimeCache.FRESHNESS
             )
-            
-            # Check if cache is older than 24 hours
-            if (timezone.now() - cached.calculated_at).days >= 1:
-                cached.is_expired = True
-                cached.save()
-                return None
-                
-            return cached
         except TravelTimeCache.DoesNotExist:
             return None
     
@@ -199,6 +194,8 @@ class GoogleMapsService:
     
     def clear_expired_cache(self):
         """Clean up expired cache entries"""
+        TravelTimeCache.expire_stale()
+        
         expired_count = TravelTimeCache.objects.filter(
             calculated_at__lt=timezone.now() - timedelta(days=7)
         ).delete()[0]
@@ -2079,7 +2079,7 @@ class DisputeViewSet(viewsets.ModelViewSet):
             )
 
         result = DisputeResolutionService.resolve_dispute(
-            dispute.id, user, resolution_notes, resolution_amount, evidence
+            dispute, user, resolution_notes, resolution_amount, evidence
         )
 
         if result:
@@ -2112,7 +2112,7 @@ class DisputeViewSet(viewsets.ModelViewSet):
             )
 
         result = DisputeResolutionService.escalate_dispute(
-            dispute.id, request.user, escalated_to, reason
+            dispute, request.user, escalated_to, reason
         )
 
         if result:
@@ -2129,9 +2129,13 @@ class DisputeViewSet(viewsets.ModelViewSet):
         dispute = self.get_object()
         page = int(request.query_params.get('page', 1))
         page_size = int(request.query_params.get('page_size', 50))
+        before_id = request.query_params.get('before_id')
 
         result = DisputeResolutionService.get_dispute_messages(
-            dispute.id, request.user, page, page_size
+            dispute.id, request.user, page, page_size,
+            before_id=int(before_id) if before_id else None,
+            # Cursor pages continue a thread the client already has a total for
+            include_total=not before_id
         )
 
         if result['success']:
@@ -2141,7 +2145,8 @@ class DisputeViewSet(viewsets.ModelViewSet):
                 'total_count': result['total_count'],
                 'page': result['page'],
                 'page_size': result['page_size'],
-                'has_more': result['has_more']
+                'has_more': result['has_more'],
+                'next_cursor': result['next_cursor']
             })
         return Response(
             {'error': result.get('error', 'Failed to get messages')},
@@ -2163,7 +2168,7 @@ class DisputeViewSet(viewsets.ModelViewSet):
             )
 
         result = DisputeResolutionService.send_message(
-            dispute.id, request.user, content, message_type, attachment
+            dispute, request.user, content, message_type, attachment
         )
 
         if result['success']:
@@ -2580,7 +2585,7 @@ class AdvancedDisputeResolutionAPIView(APIView):
     def get(self, request, dispute_id):
         """Get AI-powered dispute resolution suggestions"""
         try:
-            dispute = Dispute.objects.get(id=dispute_id)
+            dispute = AdvancedDisputeService.load(dispute_id)
             
             # Generate auto-resolution analysis
             resolution_analysis = AdvancedDisputeService.auto_resolve_disputes(dispute)
@@ -3186,11 +3191,8 @@ class VendorEarningsAPIView(APIView):
 def docusign_webhook(request):
     """Handle DocuSign webhook events"""
     try:
-        # Get the payload
-        payload = json.loads(request.body)
-        
-        # Handle the webhook event through the signature service
-        result = SignatureService.handle_docusign_webhook(payload)
+        # The raw body is parsed by the DocuSign service, avoiding a decode pass here
+        result = SignatureService.handle_docusign_webhook(request.body)
         
         if result:
             return JsonResponse({'status': 'success'})
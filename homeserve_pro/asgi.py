@@ -13,4 +13,26 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'homeserve_pro.settings')
 
 # Initialize Django ASGI application
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+
+async def application(scope, receive, send):
+    """Django handles HTTP; lifespan events are answered here so shutdown can release resources"""
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+    else:
+        await django_application(scope, receive, send)
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            # Close the DocuSign aiohttp session opened in this event loop, if any
+            from core.docusign_service import docusign_service
+            if docusign_service is not None:
+                await docusign_service.close_http_session()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
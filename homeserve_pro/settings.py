@@ -184,6 +184,14 @@ CACHES = {
 CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
 
+# Route SMTP/push bound tasks to their own queue so workers can be sized for provider limits
+# Workers must consume it: celery -A homeserve_pro worker -Q celery,notifications
+CELERY_TASK_ROUTES = {
+    'core.tasks.send_dispute_notifications_task': {'queue': 'notifications'},
+    'core.tasks.send_dispute_notifications_batch_task': {'queue': 'notifications'},
+    'core.tasks.notify_message_sent_task': {'queue': 'notifications'},
+}
+
 # Stripe Configuration
 STRIPE_PUBLISHABLE_KEY = config('STRIPE_PUBLISHABLE_KEY', default='your_stripe_publishable_key_here')
 STRIPE_SECRET_KEY = config('STRIPE_SECRET_KEY', default='your_stripe_secret_key_here')
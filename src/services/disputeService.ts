@@ -76,16 +76,18 @@ export const disputeService = {
   async getMessages(
     disputeId: string,
     page: number = 1,
-    pageSize: number = 50
+    pageSize: number = 50,
+    beforeId?: number
   ): Promise<{
     messages: DisputeMessage[];
-    total_count: number;
+    total_count: number | null;
     page: number;
     page_size: number;
     has_more: boolean;
+    next_cursor: number | null;
   }> {
     const { data } = await api.get(ENDPOINTS.DISPUTES.MESSAGES(disputeId), {
-      params: { page, page_size: pageSize },
+      params: beforeId ? { before_id: beforeId, page_size: pageSize } : { page, page_size: pageSize },
     });
     return data;
   },
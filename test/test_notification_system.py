@@ -349,7 +349,7 @@ def main():
     print("\n📋 Note: This test demonstrates the notification system.")
     print("For full functionality, start Redis and Celery services:")
     print("1. Redis: redis-server")
-    print("2. Celery Worker: celery -A homeserve_pro worker --loglevel=info")
+    print("2. Celery Worker: celery -A homeserve_pro worker -Q celery,notifications --loglevel=info")
     print("3. Celery Beat: celery -A homeserve_pro beat --loglevel=info")
     print("")
     
@@ -381,7 +381,7 @@ def main():
         print("3. Check the homeserve_pro.log file for detailed logs")
         
         print("\nTo start Celery services:")
-        print("Terminal 1: celery -A homeserve_pro worker --loglevel=info")
+        print("Terminal 1: celery -A homeserve_pro worker -Q celery,notifications --loglevel=info")
         print("Terminal 2: celery -A homeserve_pro beat --loglevel=info")
         
     except Exception as e: